@@ -0,0 +1,39 @@
+import argparse
+import cProfile
+import pstats
+
+from kyoto_reader import KyotoReader
+
+
+def load(reader: KyotoReader, relax: bool):
+    for document in reader.process_all_documents():
+        for predicate in document.get_predicates():
+            document.get_arguments(predicate, relax=relax)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='profile document loading and PAS construction')
+    parser.add_argument('source', type=str,
+                        help='path to a knp file, a directory containing knp files, or an archive')
+    parser.add_argument('--relax', action='store_true',
+                        help='also call get_arguments with relax=True for every predicate')
+    parser.add_argument('--sort', default='cumtime', type=str,
+                        help='key to sort the stats by (default: cumtime)')
+    parser.add_argument('--limit', default=30, type=int,
+                        help='number of rows to show for the whole profile (default: 30)')
+    args = parser.parse_args()
+
+    # multiprocessing is disabled so that all the work happens in this process
+    reader = KyotoReader(args.source, n_jobs=0)
+    profiler = cProfile.Profile()
+    profiler.runcall(load, reader, args.relax)
+
+    stats = pstats.Stats(profiler).strip_dirs().sort_stats(args.sort)
+    stats.print_stats(args.limit)
+    # hot spots of PAS construction
+    stats.print_stats(r'pas\.py:\d+\((add_argument|add_special_argument|_get_dep_type|__init__)\)|'
+                      r'document\.py:\d+\(_register_pas\)')
+
+
+if __name__ == '__main__':
+    main()
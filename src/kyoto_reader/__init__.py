@@ -1,11 +1,46 @@
+import importlib
 from pathlib import Path
 __version__ = Path(__file__).parent.joinpath('VERSION').open().read().rstrip()
 
+# Public names are resolved lazily on first access (PEP 562) so that `import kyoto_reader` does not pull in pyknp and
+# the whole reader stack.
+_LAZY = {
+    'KyotoReader': '.reader',
+    'Document': '.document',
+    'LazyDocument': '.document',
+    'Sentence': '.sentence',
+    'BasePhrase': '.base_phrase',
+    'Predicate': '.pas',
+    'BaseArgument': '.pas',
+    'Argument': '.pas',
+    'SpecialArgument': '.pas',
+    'Pas': '.pas',
+    'Mention': '.coreference',
+    'Entity': '.coreference',
+    'ALL_CASES': '.constants',
+    'ALL_COREFS': '.constants',
+    'UNCERTAIN': '.constants',
+    'UNSPECIFIED_PERSON': '.constants',
+    'UNSPECIFIED_OBJECT': '.constants',
+    'UNSPECIFIED_CIRCUMSTANCES': '.constants',
+    'ALL_EXOPHORS': '.constants',
+    'NE_CATEGORIES': '.constants',
+    'SID_PTN': '.constants',
+    'SID_PTN_KWDLC': '.constants',
+    'SID_PTN_WAC': '.constants',
+}
 
-from .reader import KyotoReader
-from .document import Document
-from .sentence import Sentence
-from .base_phrase import BasePhrase
-from .pas import Predicate, BaseArgument, Argument, SpecialArgument, Pas
-from .coreference import Mention, Entity
-from .constants import *
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module = importlib.import_module(_LAZY[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
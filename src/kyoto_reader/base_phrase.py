@@ -1,11 +1,15 @@
 import logging
-from typing import List, Dict, Optional, Iterator
+import sys
+from typing import List, Dict, Optional, Iterator, Tuple, Sequence
 
 from pyknp import Tag, Morpheme
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARNING)
 
+# parts of speech trimmed from both ends of a base phrase to get its core expression
+_ANCILLARY_POS = frozenset(('助詞', '特殊', '判定詞'))
+
 
 class BasePhrase:
     """文中に出現する基本句を表すクラス
@@ -17,8 +21,18 @@ class BasePhrase:
         content_dmid (int): Document-wide morpheme ID of the content word in the base phrase.
         parent (Optional[BasePhrase]): Dependency parent.
         children (List[BasePhrase]): Dependency children.
+        has_taigen (bool): Whether the base phrase has the 体言 feature.
+        has_yougen (bool): Whether the base phrase has the 用言 feature.
+        dep_case (str): The case marked by the 係 feature without the trailing "格" (e.g. "ガ"), or "" if absent.
+
+    Note:
+        Derived values such as :attr:`core` are computed once and cached, so ``tag`` must not be modified after
+        construction.
     """
 
+    __slots__ = ('tag', 'dtid', 'sid', 'doc_id', '_mrphs', '_dmids', '_mrph2dmid', '_core', '_repr', 'content',
+                 'content_dmid', 'parent', 'children', 'has_taigen', 'has_yougen', 'dep_case')
+
     def __init__(self,
                  tag: Tag,
                  dmid_offset: int,
@@ -44,25 +58,60 @@ class BasePhrase:
         self.sid: str = sid
         self.doc_id: str = doc_id
 
-        self._mrph2dmid: Dict[Morpheme, int] = {}
-        dmid = dmid_offset
-        for mrph in tag.mrph_list():
-            self._mrph2dmid[mrph] = dmid
-            dmid += 1
+        self._mrphs: Tuple[Morpheme, ...] = tuple(tag.mrph_list())
+        self._dmids: range = range(dmid_offset, dmid_offset + len(self._mrphs))
+        self._mrph2dmid: Optional[Dict[Morpheme, int]] = None  # built on demand
+
+        self._core: Optional[str] = None
+        self._repr: Optional[str] = None
 
         self.content: Morpheme = self._get_content_word()
-        self.content_dmid: int = self._mrph2dmid[self.content]
+        self.content_dmid: int = self._dmids[self._mrphs.index(self.content)]
         self.parent: Optional['BasePhrase'] = parent
         self.children: List['BasePhrase'] = children if children is not None else []
 
+        features = tag.features
+        self.has_taigen: bool = '体言' in features
+        self.has_yougen: bool = '用言' in features
+        self.dep_case: str = sys.intern(features.get('係', '').rstrip('格'))
+
     def _get_content_word(self) -> Morpheme:
         """Return the first morpheme that is a content word if any. Otherwise, return the first morpheme"""
-        for mrph in self.tag.mrph_list():
-            if '<内容語>' in mrph.fstring:
+        for mrph in self._mrphs:
+            fstring = mrph.fstring
+            if fstring and '<内容語>' in fstring:
                 return mrph
-        else:
-            logger.info(f'{self.sid}: cannot find content word in: {self.tag.midasi}. Use first mrph instead')
-            return self.tag.mrph_list()[0]
+        logger.info('%s: cannot find content word in: %s. Use first mrph instead', self.sid, self.tag.midasi)
+        return self._mrphs[0]
+
+    def __setstate__(self, state) -> None:
+        # documents pickled by kyoto-reader 2.5.2 or earlier hold the attributes in a dict instead of slots
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **state[1]}
+        for name, value in state.items():
+            setattr(self, name, value)
+        if '_mrphs' not in state:
+            self._restore_derived_state()
+
+    def _restore_derived_state(self) -> None:
+        """Compute the attributes that did not exist in kyoto-reader 2.5.2 or earlier."""
+        self._mrphs = tuple(self._mrph2dmid.keys())
+        dmid_offset = next(iter(self._mrph2dmid.values()))
+        self._dmids = range(dmid_offset, dmid_offset + len(self._mrphs))
+        self._core = None
+        self._repr = None
+        features = self.tag.features
+        self.has_taigen = '体言' in features
+        self.has_yougen = '用言' in features
+        self.dep_case = sys.intern(features.get('係', '').rstrip('格'))
+
+    def _share_state(self, bp: 'BasePhrase') -> None:
+        """Initialize this object with the attributes of an already constructed base phrase.
+
+        Unlike calling ``__init__`` again, this does not recompute derived values such as the content word.
+        """
+        for name in BasePhrase.__slots__:
+            setattr(self, name, getattr(bp, name))
 
     @property
     def dmid(self) -> int:
@@ -77,36 +126,36 @@ class BasePhrase:
     @property
     def core(self) -> str:
         """A core expression without ancillary words."""
-        mrph_list = self.tag.mrph_list()
-        sidx = 0
-        for i, mrph in enumerate(mrph_list):
-            if mrph.hinsi not in ('助詞', '特殊', '判定詞'):
-                sidx += i
-                break
-        eidx = len(mrph_list)
-        for i, mrph in enumerate(reversed(mrph_list)):
-            if mrph.hinsi not in ('助詞', '特殊', '判定詞'):
-                eidx -= i
-                break
-        ret = ''.join(mrph.midasi for mrph in mrph_list[sidx:eidx])
+        if self._core is not None:
+            return self._core
+        mrphs = self._mrphs
+        sidx, eidx = 0, len(mrphs)
+        while sidx < eidx and mrphs[sidx].hinsi in _ANCILLARY_POS:
+            sidx += 1
+        while eidx > sidx and mrphs[eidx - 1].hinsi in _ANCILLARY_POS:
+            eidx -= 1
+        ret = ''.join(mrph.midasi for mrph in mrphs[sidx:eidx])
         if not ret:
             ret = self.tag.midasi
+        self._core = ret
         return ret
 
     @property
     def mrph2dmid(self) -> Dict[Morpheme, int]:
         """A mapping from morpheme to its document-wide ID."""
+        if self._mrph2dmid is None:
+            self._mrph2dmid = dict(zip(self._mrphs, self._dmids))
         return self._mrph2dmid
 
     @property
     def mrphs(self) -> List[Morpheme]:
         """A list of morphemes."""
-        return list(self._mrph2dmid.keys())
+        return list(self._mrphs)
 
     @property
-    def dmids(self) -> List[int]:
-        """A list of document-wide morpheme IDs."""
-        return list(self._mrph2dmid.values())
+    def dmids(self) -> Sequence[int]:
+        """A sequence of document-wide morpheme IDs."""
+        return self._dmids
 
     @property
     def surf(self) -> str:
@@ -119,23 +168,30 @@ class BasePhrase:
 
     def __len__(self) -> int:
         """Number of morphemes in the base phrase"""
-        return len(self._mrph2dmid)
+        return len(self._mrphs)
 
     def __getitem__(self, mid: int) -> Optional[Morpheme]:
         if 0 <= mid < len(self):
-            return self.mrphs[mid]
+            return self._mrphs[mid]
         else:
             logger.error(f'{self.sid}: morpheme id: {mid} out of range')
             return None
 
     def __iter__(self) -> Iterator[Morpheme]:
-        return iter(self.mrphs)
+        return iter(self._mrphs)
 
     def __eq__(self, other: 'BasePhrase') -> bool:
-        return isinstance(other, BasePhrase) and self.sid == other.sid and self.dtid == other.dtid
+        if self is other:
+            return True
+        return isinstance(other, BasePhrase) and self.dtid == other.dtid and self.sid == other.sid
+
+    def __hash__(self) -> int:
+        return hash((self.dtid, self.sid))
 
     def __str__(self) -> str:
         return self.surf
 
     def __repr__(self) -> str:
-        return f'BasePhrase(dtid: {self.dtid}, mrphs: {" ".join(m.midasi for m in self)}, sid: {self.sid})'
+        if self._repr is None:
+            self._repr = f'BasePhrase(dtid: {self.dtid}, mrphs: {" ".join(m.midasi for m in self)}, sid: {self.sid})'
+        return self._repr
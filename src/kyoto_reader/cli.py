@@ -1,14 +1,13 @@
+import os
 import sys
-import shutil
 import argparse
 from pathlib import Path
 from typing import Dict
 
-from kyoto_reader import KyotoReader
-
 
 def configure(args: argparse.Namespace):
     """Create Makefile to preprocess corpus documents."""
+    import shutil
     scripts_dir = Path(__file__).parent / 'scripts'
     makefile_path = Path(args.makefile_dir or args.data_dir) / args.makefile_name
     with scripts_dir.joinpath('template.mk').open() as f:
@@ -18,13 +17,14 @@ def configure(args: argparse.Namespace):
                               out_dir=args.data_dir,
                               juman_dic_dir=args.juman_dic_dir,
                               scripts_base_dir=scripts_dir,
-                              knp=args.knp,
+                              knp=args.knp or shutil.which('knp'),
                               python=sys.executable))
     print(f'created {makefile_path.name} at {makefile_path.parent}')
 
 
 def show(args: argparse.Namespace):
     """Show the specified document in a tree format."""
+    from kyoto_reader import KyotoReader
     reader = KyotoReader(args.path, target_cases=args.cases)
     for document in reader.process_all_documents():
         document.draw_tree()
@@ -32,12 +32,28 @@ def show(args: argparse.Namespace):
 
 def list_(args: argparse.Namespace):
     """List document IDs which specified path contains."""
+    from kyoto_reader import KyotoReader
     reader = KyotoReader(args.path)
     print('\n'.join(reader.doc_ids))
 
 
+def _collect_knp_files(root: Path) -> Dict[str, str]:
+    """Recursively collect .knp files under the root directory, returning a mapping from file name to path."""
+    name2path = {}
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.knp'):
+                    name2path[entry.name] = entry.path
+    return name2path
+
+
 def idsplit(args: argparse.Namespace):
     """Copy files in a corpus to train, valid (dev), and test directory referring to ID files."""
+    import shutil
 
     corpus_dir = Path(args.corpus_dir)
     output_dir = Path(args.output_dir)
@@ -46,7 +62,7 @@ def idsplit(args: argparse.Namespace):
         print('Specify either --dev or --valid', file=sys.stderr)
         exit(1)
 
-    def write(id_file: Path, out_dir: Path, name2path: Dict[str, Path]):
+    def write(id_file: Path, out_dir: Path, name2path: Dict[str, str]):
         out_dir.mkdir(exist_ok=True)
         with id_file.open() as f:
             for line in f:
@@ -56,9 +72,9 @@ def idsplit(args: argparse.Namespace):
                     print(f'Cannot copy \'{file_name}\': No such file in {corpus_dir}', file=sys.stderr)
                     continue
                 print(f'copy {name2path[file_name]} to {out_dir}')
-                shutil.copy(str(name2path[file_name]), str(out_dir))
+                shutil.copy(name2path[file_name], str(out_dir))
 
-    knp_files = {p.name: p for p in corpus_dir.glob('**/*.knp')}
+    knp_files = _collect_knp_files(corpus_dir)
 
     if args.train:
         write(Path(args.train), output_dir / 'train', knp_files)
@@ -87,7 +103,7 @@ def main():
                              help='path to directory where Makefile will be created (default: same as --data-dir)')
     parser_conf.add_argument('--makefile-name', default='Makefile', type=str,
                              help='name of makefile to be created (default: Makefile)')
-    parser_conf.add_argument('--knp', default=shutil.which('knp'), type=str,
+    parser_conf.add_argument('--knp', default=None, type=str,
                              help='path to knp (default: follow PATH environment variable)')
     parser_conf.set_defaults(handler=configure)
 
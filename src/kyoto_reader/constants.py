@@ -1,6 +1,6 @@
 import re
 
-ALL_CASES = [
+_BASE_CASES = [
     'ガ',
     'デ',
     'ト',
@@ -57,14 +57,12 @@ ALL_CASES = [
     '時間',
     '外の関係',
 ]
-ALL_CASES += [case + '≒' for case in ALL_CASES]
 
-ALL_COREFS = [
+_BASE_COREFS = [
     '=',
     '=構',
     '=役',
 ]
-ALL_COREFS += [case + '≒' for case in ALL_COREFS]
 
 UNCERTAIN = '[不明]'  # used only in crowd sourcing annotations
 
@@ -130,7 +128,23 @@ NE_CATEGORIES = [
     'OPTIONAL',
 ]
 
-SID_PTN = re.compile(r'^(?P<sid>(?P<did>[a-zA-Z0-9-_]+?)(-(\d+))?)$')
-SID_PTN_KWDLC = re.compile(r'^(?P<sid>(?P<did>w\d{6}-\d{10})(-\d+)(-\d{2})?)$')
-# Wikipedia Annotated Corpus (under construction)
-SID_PTN_WAC = re.compile(r'^(?P<sid>(?P<did>wiki\d{8})(-\d{2})(-\d{2})?)$')
+_PATTERNS = {
+    'SID_PTN': r'^(?P<sid>(?P<did>[a-zA-Z0-9-_]+?)(-(\d+))?)$',
+    'SID_PTN_KWDLC': r'^(?P<sid>(?P<did>w\d{6}-\d{10})(-\d+)(-\d{2})?)$',
+    # Wikipedia Annotated Corpus (under construction)
+    'SID_PTN_WAC': r'^(?P<sid>(?P<did>wiki\d{8})(-\d{2})(-\d{2})?)$',
+}
+
+
+def __getattr__(name: str):
+    """Build derived constants (case lists with "≒" and compiled S-ID patterns) on first access."""
+    if name in _PATTERNS:
+        value = re.compile(_PATTERNS[name])
+    elif name == 'ALL_CASES':
+        value = _BASE_CASES + [case + '≒' for case in _BASE_CASES]
+    elif name == 'ALL_COREFS':
+        value = _BASE_COREFS + [case + '≒' for case in _BASE_COREFS]
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value
+    return value
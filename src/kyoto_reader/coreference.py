@@ -18,10 +18,18 @@ class Mention(BasePhrase):
         eids_unc (set): Uncertain entity IDs. "Uncertain" means the mention is annotated with "≒".
     """
 
+    __slots__ = ('eids', 'eids_unc', '_hash')
+
     def __init__(self, bp: BasePhrase):
         super().__init__(bp.tag, bp.dmids[0], bp.dtid, bp.sid, bp.doc_id, parent=bp.parent, children=bp.children)
         self.eids: Set[int] = set()
         self.eids_unc: Set[int] = set()
+        self._hash: int = hash((self.dtid, self.sid))
+
+    def __setstate__(self, state) -> None:
+        super().__setstate__(state)
+        # the pickled hash is not valid in an interpreter with another PYTHONHASHSEED
+        self._hash = hash((self.dtid, self.sid))
 
     @property
     def all_eids(self) -> Set[int]:
@@ -43,7 +51,7 @@ class Mention(BasePhrase):
         return self.core
 
     def __hash__(self) -> int:
-        return hash((self.dtid, self.sid))
+        return self._hash
 
 
 class Entity:
@@ -61,20 +69,37 @@ class Entity:
         mentions_unc (Set[Mention]): Mentions that have uncertain relation with this entity.
         taigen (bool, optional): Whether this entity is 体言 or not.
         yougen (bool, optional): Whether this entity is 用言 or not.
+        is_special (bool): Whether this entity corresponds to special entity, such as exophor.
     """
 
+    __slots__ = ('eid', '_exophor', 'is_special', 'mentions', 'mentions_unc', 'taigen', 'yougen')
+
     def __init__(self, eid: int, exophor: Optional[str] = None):
         self.eid: int = eid
-        self.exophor: Optional[str] = exophor
+        self.exophor = exophor
         self.mentions: Set[Mention] = set()
         self.mentions_unc: Set[Mention] = set()
         self.taigen: Optional[bool] = None
         self.yougen: Optional[bool] = None
 
+    def __setstate__(self, state) -> None:
+        # entities pickled by kyoto-reader 2.5.2 or earlier hold the attributes in a dict instead of slots, where
+        # "exophor" is set through the property to restore is_special as well
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **state[1]}
+        for name, value in state.items():
+            setattr(self, name, value)
+
     @property
-    def is_special(self) -> bool:
-        """Whether this entity corresponds to special entity, such as exophor."""
-        return self.exophor is not None
+    def exophor(self) -> Optional[str]:
+        """A string to represent exophor, such as "著者", "読者", and "不特定:人"."""
+        return self._exophor
+
+    @exophor.setter
+    def exophor(self, exophor: Optional[str]) -> None:
+        # exophor can be overwritten when entities are merged, so keep is_special in sync here
+        self._exophor: Optional[str] = exophor
+        self.is_special: bool = exophor is not None
 
     @property
     def all_mentions(self) -> Set[Mention]:
@@ -92,7 +117,7 @@ class Entity:
             uncertain (bool): Whether the mention is uncertain (i.e., annotated with "≒").
         """
         if uncertain:
-            if mention in self.all_mentions:
+            if mention in self.mentions or mention in self.mentions_unc:
                 return
             mention.eids_unc.add(self.eid)
             self.mentions_unc.add(mention)
@@ -102,8 +127,10 @@ class Entity:
             mention.eids.add(self.eid)
             self.mentions.add(mention)
         # 全ての mention の品詞が一致した場合のみ entity に品詞を設定
-        self.yougen = (self.yougen is not False) and ('用言' in mention.tag.features)
-        self.taigen = (self.taigen is not False) and ('体言' in mention.tag.features)
+        if self.yougen is not False:
+            self.yougen = mention.has_yougen
+        if self.taigen is not False:
+            self.taigen = mention.has_taigen
 
     def remove_mention(self, mention: Mention) -> None:
         """Remove a mention that is managed by this entity."""
@@ -118,8 +145,8 @@ class Entity:
         if self.is_special:
             return self.exophor
         if self.mentions:
-            return list(self.mentions)[0].__str__()
+            return next(iter(self.mentions)).__str__()
         elif self.mentions_unc:
-            return list(self.mentions_unc)[0].__str__()
+            return next(iter(self.mentions_unc)).__str__()
         else:
             return str(None)
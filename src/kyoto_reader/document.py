@@ -1,9 +1,8 @@
-import _pickle as cPickle
-import copy
 import io
 import logging
-from collections import OrderedDict, ChainMap, defaultdict
-from typing import List, Dict, Set, Optional, Iterator, TextIO, Collection
+import re
+from collections import OrderedDict, Counter, defaultdict
+from typing import List, Dict, Set, FrozenSet, Tuple, Optional, Iterator, TextIO, Collection
 
 import jaconv
 from pyknp import BList, Bunsetsu, Tag, Morpheme, Rel
@@ -18,6 +17,25 @@ from .sentence import Sentence
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARNING)
 
+_ALL_CASES = frozenset(ALL_CASES)
+_ALL_EXOPHORS = frozenset(ALL_EXOPHORS)
+_ALL_RELS = frozenset(ALL_CASES + ALL_COREFS)
+# exophors that can correspond to multiple entities (i.e., not singleton)
+_PLURAL_EXOPHORS = frozenset(('不特定:人', '不特定:物', '不特定:状況'))
+# the content of a <rel ...> tag in tag.fstring, where tags are delimited by "><"
+_REL_TAG_PTN = re.compile(r'(?:^<|><)(rel .*?)(?=><|.\Z)')
+_H2Z_DIGIT = str.maketrans('0123456789', '０１２３４５６７８９')
+_HALF_WIDTH_KANA_PTN = re.compile('[\uff61-\uff9f]')
+# a line that ends a sentence
+_EOS_LINE_PTN = re.compile(r'^[^\S\n]*EOS[^\S\n]*$', re.MULTILINE)
+
+
+def _h2z(text: str) -> str:
+    """Equivalent to jaconv.h2z(text, digit=True), but skips jaconv unless the text has half-width kana."""
+    if _HALF_WIDTH_KANA_PTN.search(text) is not None:
+        return jaconv.h2z(text, digit=True)
+    return text.translate(_H2Z_DIGIT)
+
 
 class Document:
     """A class to represent a document of KWDLC, KyotoCorpus, or AnnotatedFKCCorpus.
@@ -56,29 +74,41 @@ class Document:
         self.doc_id: str = doc_id
         self.cases: Collection[str] = cases
         self.corefs: Collection[str] = corefs
+        self._cases: FrozenSet[str] = frozenset(cases)
+        self._corefs: FrozenSet[str] = frozenset(corefs)
         self.relax_cases: bool = relax_cases
         self.extract_nes: bool = extract_nes
         self.use_pas_tag: bool = use_pas_tag
 
         self.sid2sentence: Dict[str, Sentence] = OrderedDict()
         dtid = dmid = 0
-        buff = ''
-        for line in knp_string.strip().split('\n'):
-            buff += line + '\n'
-            if line.strip() == 'EOS':
-                sentence = Sentence(buff, dtid, dmid, doc_id)
-                if sentence.sid in self.sid2sentence:
-                    logger.warning(f'{sentence.sid}: duplicated sid found')
-                self.sid2sentence[sentence.sid] = sentence
-                dtid += len(sentence)
-                dmid += len(sentence.mrph_list())
-                buff = ''
-
-        self._mrph2dmid: Dict[Morpheme, int] = dict(ChainMap(*(sent.mrph2dmid for sent in self.sentences)))
+        text = knp_string.strip()
+        start = 0
+        for eos_match in _EOS_LINE_PTN.finditer(text):
+            sentence = Sentence(text[start:eos_match.end()] + '\n', dtid, dmid, doc_id)
+            if sentence.sid in self.sid2sentence:
+                logger.warning(f'{sentence.sid}: duplicated sid found')
+            self.sid2sentence[sentence.sid] = sentence
+            dtid += len(sentence)
+            dmid += len(sentence.mrph_list())
+            start = eos_match.end() + 1
+        # sid2sentence is not modified after this point
+        self._sentences: List[Sentence] = list(self.sid2sentence.values())
+
+        self._sid_tid2bp: Dict[Tuple[str, int], BasePhrase] = {
+            (sentence.sid, bp.tid): bp for sentence in self.sentences for bp in sentence.bps
+        }
+        self._mrph2dmid: Dict[Morpheme, int] = {}
+        for sentence in self.sentences:
+            self._mrph2dmid.update(sentence.mrph2dmid)
 
         self._pas: Dict[int, Pas] = OrderedDict()
+        self._eid2special_args: Dict[int, List[SpecialArgument]] = defaultdict(list)
         self.mentions: Dict[int, Mention] = {}
         self.entities: Dict[int, Entity] = {}
+        self._exophor2entity: Dict[str, Entity] = {}  # singleton entities
+        # (predicate dtid, include_optional) -> PAS whose arguments are extended by coreference relations
+        self._relaxed_pas: Dict[Tuple[int, bool], Pas] = {}
         if use_pas_tag:
             self._analyze_pas()
         else:
@@ -88,6 +118,26 @@ class Document:
             self.named_entities: List[NamedEntity] = []
             self._extract_nes()
 
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if 'sid2sentence' in state and '_sentences' not in state:
+            # pickled by kyoto-reader 2.5.2 or earlier
+            self._cases = frozenset(self.cases)
+            self._corefs = frozenset(self.corefs)
+            self._sentences = list(self.sid2sentence.values())
+            self._sid_tid2bp = {(sentence.sid, bp.tid): bp for sentence in self._sentences for bp in sentence.bps}
+            self._eid2special_args = defaultdict(list)
+            for pas in self._pas.values():
+                for args in pas.arguments.values():
+                    for arg in args:
+                        if isinstance(arg, SpecialArgument):
+                            self._eid2special_args[arg.eid].append(arg)
+            self._exophor2entity = {
+                entity.exophor: entity for entity in self.entities.values()
+                if entity.exophor and entity.exophor not in _PLURAL_EXOPHORS
+            }
+            self._relaxed_pas = {}
+
     def _analyze_pas(self) -> None:
         """Extract predicate-argument structures represented in <述語項構造: > tags."""
         sid2idx = {sid: idx for idx, sid in enumerate(self.sid2sentence.keys())}
@@ -97,10 +147,10 @@ class Document:
             pas = Pas(bp)
             for case, arguments in bp.tag.pas.arguments.items():
                 if self.relax_cases:
-                    if case in ALL_CASES and case.endswith('≒'):
-                        case = case.rstrip('≒')  # ガ≒ -> ガ
+                    if case in _ALL_CASES and case[-1] == '≒':
+                        case = case[:-1]  # ガ≒ -> ガ
                 for arg in arguments:
-                    arg.midasi = jaconv.h2z(arg.midasi, digit=True)  # 不特定:人1 -> 不特定:人１
+                    arg.midasi = _h2z(arg.midasi)  # 不特定:人1 -> 不特定:人１
                     # exophor
                     if arg.flag == 'E':
                         entity = self._create_entity(exophor=arg.midasi, eid=arg.eid)
@@ -111,7 +161,7 @@ class Document:
                         _ = self._create_mention(arg_bp)
                         pas.add_argument(case, arg_bp, '')
             if pas.arguments:
-                self._pas[pas.dtid] = pas
+                self._register_pas(pas)
 
     def _analyze_rel(self) -> None:
         """Extract predicate-argument structures and coreference relations represented in <rel> tags"""
@@ -119,14 +169,14 @@ class Document:
             rels = []
             for rel in self._extract_rel_tags(bp.tag):
                 if self.relax_cases:
-                    if rel.atype in ALL_CASES and rel.atype.endswith('≒'):
-                        rel.atype = rel.atype.rstrip('≒')  # ガ≒ -> ガ
+                    if rel.atype in _ALL_CASES and rel.atype[-1] == '≒':
+                        rel.atype = rel.atype[:-1]  # ガ≒ -> ガ
                 valid = True
                 if rel.sid is not None and rel.sid not in self.sid2sentence:
                     logger.warning(f'{bp.sid}: sentence: {rel.sid} not found in {self.doc_id}')
                     valid = False
-                if rel.atype in (ALL_CASES + ALL_COREFS):
-                    if not (rel.atype in self.cases or rel.atype in self.corefs):
+                if rel.atype in _ALL_RELS:
+                    if not (rel.atype in self._cases or rel.atype in self._corefs):
                         logger.info(f'{bp.sid}: relation type: {rel.atype} is ignored')
                         valid = False
                 else:
@@ -137,7 +187,7 @@ class Document:
             # extract PAS
             pas = Pas(bp)
             for rel in rels:
-                if rel.atype in self.cases:
+                if rel.atype in self._cases:
                     if rel.sid is not None:
                         assert rel.tid is not None
                         arg_bp = self._get_bp(rel.sid, rel.tid)
@@ -151,40 +201,39 @@ class Document:
                         if rel.target == 'なし':
                             pas.set_arguments_optional(rel.atype)
                             continue
-                        if rel.target not in ALL_EXOPHORS:
+                        if rel.target not in _ALL_EXOPHORS:
                             logger.warning(f'{pas.sid}:unknown exophor: {rel.target}')
                             continue
                         entity = self._create_entity(rel.target)
                         pas.add_special_argument(rel.atype, rel.target, entity.eid, rel.mode)
             if pas.arguments:
-                self._pas[pas.dtid] = pas
+                self._register_pas(pas)
 
             # extract coreference
             for rel in rels:
-                if rel.atype in self.corefs:
+                if rel.atype in self._corefs:
                     if rel.mode in ('', 'AND'):  # ignore "OR" and "?"
                         self._add_corefs(bp, rel)
 
+    def _register_pas(self, pas: Pas) -> None:
+        """Register a predicate-argument structure and index its special arguments by entity ID."""
+        self._pas[pas.dtid] = pas
+        for args in pas.arguments.values():
+            for arg in args:
+                if isinstance(arg, SpecialArgument):
+                    self._eid2special_args[arg.eid].append(arg)
+
     # to extract rels with mode: '?', rewrite initializer of pyknp Features class
     @staticmethod
     def _extract_rel_tags(tag: Tag) -> List[Rel]:
         """Parse tag.fstring to extract <rel> tags."""
-        splitter = "><"
         rels = []
-        spec = tag.fstring
-
-        tag_start = 1
-        tag_end = None
-        while tag_end != -1:
-            tag_end = spec.find(splitter, tag_start)
-            if spec[tag_start:].startswith('rel '):
-                rel = Rel(spec[tag_start:tag_end])
-                if rel.target:
-                    rel.target = jaconv.h2z(rel.target, digit=True)  # 不特定:人1 -> 不特定:人１
-                if rel.atype is not None:
-                    rels.append(rel)
-
-            tag_start = tag_end + len(splitter)
+        for match in _REL_TAG_PTN.finditer(tag.fstring):
+            rel = Rel(match.group(1))
+            if rel.target:
+                rel.target = _h2z(rel.target)  # 不特定:人1 -> 不特定:人１
+            if rel.atype is not None:
+                rels.append(rel)
         return rels
 
     def _add_corefs(self,
@@ -201,19 +250,28 @@ class Document:
                 return
         else:
             target_bp = None
-            if rel.target not in ALL_EXOPHORS:
+            if rel.target not in _ALL_EXOPHORS:
                 logger.warning(f'{source_bp.sid}: unknown exophor: {rel.target}')
                 return
 
-        uncertain: bool = rel.atype.endswith('≒')
+        uncertain: bool = rel.atype[-1] == '≒'
         source_mention = self._create_mention(source_bp)
+        target_mention = self._create_mention(target_bp) if rel.sid is not None else None
+        # source と target が既に同一の entity のみを certain に指している場合、_merge_entities は何もしない
+        if (
+            target_mention is not None
+            and len(source_mention.eids) == 1
+            and not source_mention.eids_unc
+            and not target_mention.eids_unc
+            and source_mention.eids == target_mention.eids
+        ):
+            return
         for eid in source_mention.all_eids:
             # _merge_entities によって source_mention の eid が削除されているかもしれない
             if eid not in self.entities:
                 continue
             source_entity = self.entities[eid]
-            if rel.sid is not None:
-                target_mention = self._create_mention(target_bp)
+            if target_mention is not None:
                 for target_eid in target_mention.all_eids:
                     target_entity = self.entities[target_eid]
                     self._merge_entities(source_mention, target_mention, source_entity, target_entity, uncertain)
@@ -262,21 +320,20 @@ class Document:
              Entity: An entity to be created.
         """
         if exophor:
-            if exophor not in ('不特定:人', '不特定:物', '不特定:状況'):  # exophor が singleton entity だった時
-                entities = [e for e in self.entities.values() if exophor == e.exophor]
+            if exophor not in _PLURAL_EXOPHORS:  # exophor が singleton entity だった時
                 # すでに singleton entity が存在した場合、新しい entity は作らずにその entity を返す
-                if entities:
-                    assert len(entities) == 1  # singleton entity が1つしかないことを保証
-                    return entities[0]
-        eids: Set[int] = {e.eid for e in self.entities.values()}
-        if eid in eids:
+                if exophor in self._exophor2entity:
+                    return self._exophor2entity[exophor]
+        if eid in self.entities:
             eid_ = eid
-            eid: int = max(eids) + 1
+            eid: int = max(self.entities) + 1
             logger.warning(f'{self.doc_id}:eid: {eid_} is already used. use eid: {eid} instead.')
         elif eid is None or eid < 0:
-            eid: int = max(eids) + 1 if eids else 0
+            eid: int = max(self.entities, default=-1) + 1
         entity = Entity(eid, exophor=exophor)
         self.entities[eid] = entity
+        if exophor and exophor not in _PLURAL_EXOPHORS:
+            self._exophor2entity[exophor] = entity
         return entity
 
     def _merge_entities(self,
@@ -322,12 +379,14 @@ class Document:
         # 以下 te を削除する準備
         if se.exophor is None:
             se.exophor = te.exophor
+            if self._exophor2entity.get(te.exophor) is te:
+                self._exophor2entity[te.exophor] = se
         for tm in te.all_mentions:
             se.add_mention(tm, uncertain=tm.is_uncertain_to(te))
         # argument も eid を持っているので eid が変わった場合はこちらも更新
-        for arg in [arg for pas in self._pas.values() for args in pas.arguments.values() for arg in args]:
-            if isinstance(arg, SpecialArgument) and arg.eid == te.eid:
-                arg.eid = se.eid
+        for arg in self._eid2special_args.pop(te.eid, []):
+            arg.eid = se.eid
+            self._eid2special_args[se.eid].append(arg)
         self._delete_entity(te.eid, source_mention.sid)  # delete target entity
 
     def _delete_entity(self,
@@ -347,6 +406,8 @@ class Document:
             return
         entity = self.entities[eid]
         logger.info(f'{sid}: delete entity: {eid} ({entity})')
+        if self._exophor2entity.get(entity.exophor) is entity:
+            del self._exophor2entity[entity.exophor]
         for mention in entity.all_mentions:
             entity.remove_mention(mention)
         self.entities.pop(eid)
@@ -364,16 +425,16 @@ class Document:
         Returns:
             Optional[BasePhrase]: The base phrase that has sentence ID of sid and tag ID of tid.
         """
-        sentence = self[sid]
-        if not (0 <= tid < len(sentence.bps)):
+        bp = self._sid_tid2bp.get((sid, tid))
+        if bp is None:
             logger.warning(f'{sid}: tag id: {tid} out of range')
-            return None
-        return sentence.bps[tid]
+        return bp
 
     def _extract_nes(self) -> None:
         """Extract named entities referring tag objects."""
         for sentence in self.sentences:
             tag_list = sentence.tag_list()
+            sent_mrph_list = sentence.mrph_list()
             # tag.features = {'NE': 'LOCATION:ダーマ神殿'}
             for tag in tag_list:
                 if 'NE' not in tag.features:
@@ -382,12 +443,12 @@ class Document:
                 if category not in NE_CATEGORIES:
                     logger.warning(f'{sentence.sid}: unknown NE category: {category}')
                     continue
-                mrph_list = [m for t in tag_list[:tag.tag_id + 1] for m in t.mrph_list()]
+                mrph_list = sent_mrph_list[:tag.mrph_list()[-1].mrph_id + 1]
                 mrph_span = self._find_mrph_span(name, mrph_list, tag)
                 if mrph_span is None:
                     logger.warning(f'{sentence.sid}: mrph span of \'{name}\' not found')
                     continue
-                ne = NamedEntity(category, name, sentence, mrph_span, self._mrph2dmid)
+                ne = NamedEntity(category, name, sentence, mrph_span)
                 self.named_entities.append(ne)
 
     @staticmethod
@@ -396,23 +457,30 @@ class Document:
                         tag: Tag
                         ) -> Optional[range]:
         """nameにマッチする形態素の範囲を返す"""
+        surf = ''.join(mrph.midasi for mrph in mrph_list)
+        # offsets[i]: surf における mrph_list[i] の開始位置
+        offsets = [0]
+        for mrph in mrph_list:
+            offsets.append(offsets[-1] + len(mrph.midasi))
+        offset2idx = {offset: idx for idx, offset in enumerate(offsets[:-1])}
         for i in range(len(tag.mrph_list())):
             end_mid = len(mrph_list) - i
-            mrph_span = ''
-            for mrph in reversed(mrph_list[:end_mid]):
-                mrph_span = mrph.midasi + mrph_span
-                if mrph_span == name:
-                    return range(mrph.mrph_id, end_mid)
+            end = offsets[end_mid]
+            start_idx = offset2idx.get(end - len(name))
+            if start_idx is not None and start_idx < end_mid and surf[offsets[start_idx]:end] == name:
+                return range(mrph_list[start_idx].mrph_id, end_mid)
         return None
 
     @property
     def sentences(self) -> List['Sentence']:
         """List of sentences in this document.
 
+        The returned list is shared and must not be modified.
+
         Returns:
             List[Sentence]
         """
-        return list(self.sid2sentence.values())
+        return self._sentences
 
     @property
     def mrph2dmid(self) -> Dict[Morpheme, int]:
@@ -479,29 +547,43 @@ class Document:
         """
         if predicate.dtid not in self._pas:
             return defaultdict(list)
-        pas = copy.copy(self._pas[predicate.dtid])
-        pas.arguments = cPickle.loads(cPickle.dumps(pas.arguments, -1))
-        if include_optional is False:
-            for case in self.cases:
-                pas.arguments[case] = list(filter(lambda a: a.optional is False, pas.arguments[case]))
+        if relax is False:
+            return self._pas[predicate.dtid]._clone_shallow(self._optional_excluded_cases(include_optional)).arguments
 
-        if relax is True:
-            for case, args in self._pas[predicate.dtid].arguments.items():
-                for arg in args:
-                    if isinstance(arg, SpecialArgument):
-                        entities = [self.entities[arg.eid]]
-                    else:
-                        assert isinstance(arg, Argument)
-                        entities = self.get_entities(arg, include_uncertain=True)
-                    for entity in entities:
-                        if entity.is_special and entity.exophor != str(arg):
-                            pas.add_special_argument(case, entity.exophor, entity.eid, 'AND')
-                        for mention in entity.all_mentions:
-                            if isinstance(arg, Argument) and mention.dtid == arg.dtid:
-                                continue
-                            pas.add_argument(case, mention, 'AND')
-
-        return pas.arguments
+        # the document is not modified after construction, so the relaxed arguments are computed only once
+        key = (predicate.dtid, include_optional)
+        if key not in self._relaxed_pas:
+            self._relaxed_pas[key] = self._relax_pas(self._pas[predicate.dtid], include_optional)
+        return self._relaxed_pas[key]._clone_shallow().arguments
+
+    def _optional_excluded_cases(self, include_optional: bool) -> Collection[str]:
+        # optional arguments are removed only from the target cases, which are always present in the result
+        return () if include_optional else self.cases
+
+    def _relax_pas(self, orig_pas: Pas, include_optional: bool) -> Pas:
+        """Return a copy of the given PAS extended with arguments that have a coreference relation with its arguments.
+
+        Args:
+            orig_pas (Pas): A PAS registered in this document.
+            include_optional (bool): If True, keep adverbial arguments such as "すぐに".
+        """
+        # shallow copy is enough since arguments are only added below, never modified
+        pas = orig_pas._clone_shallow(self._optional_excluded_cases(include_optional))
+        for case, args in orig_pas.arguments.items():
+            for arg in args:
+                if isinstance(arg, SpecialArgument):
+                    entities = [self.entities[arg.eid]]
+                else:
+                    assert isinstance(arg, Argument)
+                    entities = self.get_entities(arg, include_uncertain=True)
+                for entity in entities:
+                    if entity.is_special and entity.exophor != str(arg):
+                        pas.add_special_argument(case, entity.exophor, entity.eid, 'AND')
+                    for mention in entity.all_mentions:
+                        if isinstance(arg, Argument) and mention.dtid == arg.dtid:
+                            continue
+                        pas.add_argument(case, mention, 'AND')
+        return pas
 
     def get_siblings(self, mention: Mention, relax: bool = False) -> Set[Mention]:
         """Return all the mentions that have coreference chains with the specified mention.
@@ -520,7 +602,7 @@ class Document:
         if relax is True:
             for eid in mention.eids_unc:
                 entity = self.entities[eid]
-                mentions.update(entity.all_mentions)
+                mentions.update(entity.mentions, entity.mentions_unc)
         if mention in mentions:
             mentions.remove(mention)
         return mentions
@@ -562,7 +644,7 @@ class Document:
             blist.draw_tag_tree(fh=string, show_pos=False)
             tree_strings = string.getvalue().rstrip('\n').split('\n')
         assert len(tree_strings) == len(blist.tag_list())
-        all_targets = [str(m) for m in self.mentions.values()]
+        target_counts = Counter(str(m) for m in self.mentions.values())
         tid2mention = {mention.tid: mention for mention in self.mentions.values() if mention.sid == sid}
         for bp in self[sid].bps:
             tree_strings[bp.tid] += '  '
@@ -573,7 +655,7 @@ class Document:
                 targets = set()
                 for arg in args:
                     target = str(arg)
-                    if all_targets.count(str(arg)) > 1 and isinstance(arg, Argument):
+                    if target_counts[target] > 1 and isinstance(arg, Argument):
                         target += str(arg.dtid)
                     targets.add(target)
                 if targets:
@@ -585,7 +667,7 @@ class Document:
                 targets = set()
                 for tgt_mention in tgt_mentions:
                     target = str(tgt_mention)
-                    if all_targets.count(target) > 1:
+                    if target_counts[target] > 1:
                         target += str(tgt_mention.dtid)
                     targets.add(target)
                 for eid in src_mention.eids:
@@ -601,10 +683,11 @@ class Document:
         """Calculate various kinds of statistics of this document."""
         ret = dict()
         ret['num_sents'] = len(self)
-        ret['num_tags'] = len(self.tag_list())
+        bp_list = self.bp_list()
+        ret['num_tags'] = len(bp_list)
         ret['num_mrphs'] = len(self.mrph_list())
-        ret['num_taigen'] = sum(1 for tag in self.tag_list() if '体言' in tag.features)
-        ret['num_yougen'] = sum(1 for tag in self.tag_list() if '用言' in tag.features)
+        ret['num_taigen'] = sum(1 for bp in bp_list if bp.has_taigen)
+        ret['num_yougen'] = sum(1 for bp in bp_list if bp.has_yougen)
         ret['num_entities'] = len(self.entities)
         ret['num_special_entities'] = sum(1 for ent in self.entities.values() if ent.is_special)
 
@@ -614,9 +697,9 @@ class Document:
             if tgt_mentions:
                 num_mention += 1
             for tgt_mention in tgt_mentions:
-                if '体言' in tgt_mention.tag.features:
+                if tgt_mention.has_taigen:
                     num_taigen += 1
-                if '用言' in tgt_mention.tag.features:
+                if tgt_mention.has_yougen:
                     num_yougen += 1
         ret['num_mentions'] = num_mention
         ret['num_taigen_mentions'] = num_taigen
@@ -645,3 +728,51 @@ class Document:
 
     def __repr__(self) -> str:
         return f'Document([' + ', '.join(sent.surf for sent in self) + f'], did={self.doc_id})'
+
+
+class LazyDocument(Document):
+    """A document that parses the KNP format string on the first access to an attribute that requires parsing.
+
+    ``knp_string`` and ``doc_id`` are available without parsing. Once parsed, it behaves exactly like
+    :class:`Document`.
+
+    Args:
+        knp_string (str): KNP format string of the document.
+        doc_id (str): A document ID.
+        cases (Collection[str]): Cases to extract.
+        corefs (Collection[str]): Coreference relations to extract.
+        relax_cases (bool): Whether to consider relations with "≒" as those without "≒" (e.g. ガ≒格 -> ガ格).
+        extract_nes (bool): Whether to extract named entities.
+        use_pas_tag (bool): Whether to read predicate-argument structures from <述語項構造: > tags, not <rel> tags.
+    """
+
+    def __init__(self,
+                 knp_string: str,
+                 doc_id: str,
+                 cases: Collection[str],
+                 corefs: Collection[str],
+                 relax_cases: bool,
+                 extract_nes: bool,
+                 use_pas_tag: bool,
+                 ) -> None:
+        self.knp_string: str = knp_string
+        self.doc_id: str = doc_id
+        self._init_args = (cases, corefs, relax_cases, extract_nes, use_pas_tag)
+
+    def __getattr__(self, name: str):
+        # called only when the attribute is not found, i.e., the document has not been parsed yet
+        # special names are looked up by protocols such as pickle and copy, which should not trigger parsing
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+        init_args = self.__dict__.pop('_init_args', None)
+        if init_args is None:
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+        state = dict(self.__dict__)
+        try:
+            Document.__init__(self, self.knp_string, self.doc_id, *init_args)
+        except BaseException:
+            # discard the partially parsed attributes so that the next access raises the same error again
+            self.__dict__.clear()
+            self.__dict__.update(state, _init_args=init_args)
+            raise
+        return getattr(self, name)
@@ -1,7 +1,3 @@
-from typing import Dict
-
-from pyknp import Morpheme
-
 from .sentence import Sentence
 
 
@@ -13,7 +9,6 @@ class NamedEntity:
         name (str): A name of a NE.
         sentence (Sentence): A sentence that contains a NE.
         mid_range (range): A range of IDs of morphemes that constitute a NE.
-        mrph2dmid (dict): A mapping from morpheme to its document-wide ID.
 
     Attributes:
         category (str): A category of a NE.
@@ -23,19 +18,27 @@ class NamedEntity:
         dmid_range (range): A range of document-wide IDs of morphemes that constitute a NE.
     """
 
+    __slots__ = ('category', 'name', 'sid', 'mid_range', 'dmid_range')
+
     def __init__(self,
                  category: str,
                  name: str,
                  sentence: Sentence,
-                 mid_range: range,
-                 mrph2dmid: Dict[Morpheme, int]):
+                 mid_range: range):
         self.category: str = category
         self.name: str = name
         self.sid: str = sentence.sid
         self.mid_range: range = mid_range
-        dmid_start = mrph2dmid[sentence.mrph_list()[mid_range[0]]]
-        dmid_end = mrph2dmid[sentence.mrph_list()[mid_range[-1]]]
-        self.dmid_range: range = range(dmid_start, dmid_end + 1)
+        # morphemes in a sentence have consecutive document-wide IDs starting from sentence.dmid_offset
+        dmid_start = sentence.dmid_offset + mid_range[0]
+        self.dmid_range: range = range(dmid_start, dmid_start + len(mid_range))
+
+    def __setstate__(self, state) -> None:
+        # named entities pickled by kyoto-reader 2.5.2 or earlier hold the attributes in a dict instead of slots
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **state[1]}
+        for name, value in state.items():
+            setattr(self, name, value)
 
     def __str__(self) -> str:
         return self.name
@@ -1,7 +1,8 @@
 import logging
+import sys
 from abc import abstractmethod
 from collections import defaultdict
-from typing import List, Dict
+from typing import List, Dict, Set, Optional, Collection
 
 from .base_phrase import BasePhrase
 
@@ -12,13 +13,20 @@ logger.setLevel(logging.WARNING)
 # a class to represent a predicate
 Predicate = BasePhrase
 
+# cases whose overt argument is marked by a different 係 case
+_OVERT_CASE_ALIASES = {'判ガ': 'ガ', 'ノ？': 'ノ'}
+
 
 class BaseArgument:
     """A base class for all kinds of arguments"""
 
+    # 属性 (dep_type, mode, optional) のスロットは各サブクラスで宣言する
+    # (Argument は BasePhrase とスロットを持つ基底クラスを同時に継承できないため)
+    __slots__ = ()
+
     def __init__(self, dep_type: str, mode: str):
-        self.dep_type: str = dep_type
-        self.mode: str = mode
+        self.dep_type: str = dep_type  # always one of the string literals in Pas._get_dep_type, which are interned
+        self.mode: str = sys.intern(mode)  # parsed from the input, so intern to share the handful of distinct values
         self.optional = False
 
     @property
@@ -48,14 +56,15 @@ class Argument(BasePhrase, BaseArgument):
         mode (str): モード
     """
 
+    __slots__ = ('dep_type', 'mode', 'optional')
+
     def __init__(self,
                  bp: BasePhrase,
                  dep_type: str,
                  mode: str,
                  ) -> None:
-        super(Argument, self).__init__(bp.tag, bp.dmids[0], bp.dtid, bp.sid, bp.doc_id, parent=bp.parent,
-                                       children=bp.children)  # initialize BasePhrase
-        super(BasePhrase, self).__init__(dep_type, mode)  # initialize BaseArgument
+        self._share_state(bp)  # initialize BasePhrase
+        BaseArgument.__init__(self, dep_type, mode)
 
     def __repr__(self):
         return f'Argument(bp: {repr(super(Argument, self))}, dep_type: {self.dep_type}, mode: {self.mode})'
@@ -82,12 +91,21 @@ class SpecialArgument(BaseArgument):
         mode (str): モード
     """
 
+    __slots__ = ('eid', 'exophor', 'dep_type', 'mode', 'optional')
+
     def __init__(self, exophor: str, eid: int, mode: str):
         self.eid = eid
         dep_type = 'exo'
         super().__init__(dep_type, mode)
         self.exophor: str = exophor
 
+    def __setstate__(self, state) -> None:
+        # arguments pickled by kyoto-reader 2.5.2 or earlier hold the attributes in a dict instead of slots
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **state[1]}
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __repr__(self):
         return f'SpecialArgument(exophor: {self.exophor}, eid: {self.eid}, mode: {self.mode})'
 
@@ -95,7 +113,10 @@ class SpecialArgument(BaseArgument):
         return self.exophor
 
     def __eq__(self, other: BaseArgument):
-        return isinstance(other, SpecialArgument) and self.exophor == other.exophor
+        return type(other) is SpecialArgument and self.exophor == other.exophor
+
+    def __hash__(self):
+        return hash(self.exophor)
 
     # for test
     def __iter__(self):
@@ -116,44 +137,88 @@ class Pas:
         arguments (Dict[str, List[BaseArgument]]): 格と項
     """
 
+    __slots__ = ('predicate', 'arguments', '_arg_dtids', '_arg_exophors', '_child_dtids', '_parent_dtid')
+
     def __init__(self, pred_bp: BasePhrase):
         # self.predicate = Predicate(pred_bp.tag, pred_bp.dtid, pred_bp.sid)
         self.predicate: Predicate = pred_bp
         self.arguments: Dict[str, List[BaseArgument]] = defaultdict(list)
+        # dtids and exophors of arguments already added for each case, used to skip duplicates before construction
+        self._arg_dtids: Dict[str, Set[int]] = defaultdict(set)
+        self._arg_exophors: Dict[str, Set[str]] = defaultdict(set)
+        # dtid で比較するので Mention が項として渡されても BasePhrase の __eq__ と同じ結果になる
+        self._child_dtids: Set[int] = {child.dtid for child in pred_bp.children}
+        self._parent_dtid: Optional[int] = pred_bp.parent.dtid if pred_bp.parent is not None else None
+
+    def __setstate__(self, state) -> None:
+        # PASs pickled by kyoto-reader 2.5.2 or earlier hold only the predicate and the arguments in a dict
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **state[1]}
+        for name, value in state.items():
+            setattr(self, name, value)
+        if '_arg_dtids' not in state:
+            clone = self._clone_shallow()
+            for name in ('_arg_dtids', '_arg_exophors', '_child_dtids', '_parent_dtid'):
+                setattr(self, name, getattr(clone, name))
+
+    def _clone_shallow(self, optional_excluded_cases: Collection[str] = ()) -> 'Pas':
+        """Return a copy of this PAS that shares the predicate and argument objects but not the argument lists.
+
+        Args:
+            optional_excluded_cases (Collection[str]): Cases whose optional arguments are not copied. These cases
+                always have an entry in the arguments of the copy, which may be empty.
+        """
+        pas = Pas(self.predicate)
+        for case, args in self.arguments.items():
+            pas.arguments[case] = list(args)
+        for case in optional_excluded_cases:
+            pas.arguments[case] = [arg for arg in pas.arguments[case] if not arg.optional]
+        for case, args in pas.arguments.items():
+            for arg in args:
+                if isinstance(arg, SpecialArgument):
+                    pas._arg_exophors[case].add(arg.exophor)
+                else:
+                    pas._arg_dtids[case].add(arg.dtid)
+        return pas
 
     def add_argument(self, case: str, bp: BasePhrase, mode: str):
-        dep_type = self._get_dep_type(self.predicate, bp, case)
-        argument = Argument(bp, dep_type, mode)
-        if argument not in self.arguments[case]:
-            self.arguments[case].append(argument)
-
-    @staticmethod
-    def _get_dep_type(pred: BasePhrase, arg: BasePhrase, case: str) -> str:
-        if arg in pred.children:
-            dep_case = arg.tag.features.get('係', '').rstrip('格')
-            if (case == dep_case) or (case == '判ガ' and dep_case == 'ガ') or (case == 'ノ？' and dep_case == 'ノ'):
+        case = sys.intern(case)
+        dtids = self._arg_dtids[case]
+        if bp.dtid in dtids:
+            return
+        dep_type = self._get_dep_type(bp, case)
+        self.arguments[case].append(Argument(bp, dep_type, mode))
+        dtids.add(bp.dtid)
+
+    def _get_dep_type(self, arg: BasePhrase, case: str) -> str:
+        if arg.dtid in self._child_dtids:
+            dep_case = arg.dep_case
+            if case == dep_case or _OVERT_CASE_ALIASES.get(case) == dep_case:
                 return 'overt'
             else:
                 return 'dep'
-        elif arg == pred.parent:
+        elif arg.dtid == self._parent_dtid:
             return 'dep'
-        elif arg.sid == pred.sid:
+        elif arg.sid == self.predicate.sid:
             return 'intra'
         else:
             return 'inter'
 
     def add_special_argument(self, case: str, exophor: str, eid: int, mode: str) -> None:
-        special_argument = SpecialArgument(exophor, eid, mode)
-        if special_argument not in self.arguments[case]:
-            self.arguments[case].append(special_argument)
+        case = sys.intern(case)
+        exophors = self._arg_exophors[case]
+        if exophor in exophors:
+            return
+        self.arguments[case].append(SpecialArgument(exophor, eid, mode))
+        exophors.add(exophor)
 
     def set_arguments_optional(self, case: str) -> None:
         if not self.arguments[case]:
-            logger.info(f'{self.sid:24}no preceding argument found. なし is ignored')
+            logger.info('%-24sno preceding argument found. なし is ignored', self.sid)
             return
         for arg in self.arguments[case]:
             arg.optional = True
-            logger.info(f'{self.sid:24}marked {arg} as optional')
+            logger.info('%-24smarked %s as optional', self.sid, arg)
 
     @property
     def dtid(self) -> int:
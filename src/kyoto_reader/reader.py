@@ -1,24 +1,63 @@
 import gzip
-import io
 import logging
 import os
 import pickle
+import re
 import tarfile
+import threading
 import zipfile
-from collections import ChainMap
+from collections import deque, OrderedDict
 from concurrent import futures
-from contextlib import contextmanager, nullcontext
+from contextlib import contextmanager, nullcontext, ExitStack
 from enum import Enum
-from functools import partial
+from itertools import repeat
 from pathlib import Path
-from typing import List, Dict, Optional, Union, Iterable, Collection, Any, BinaryIO, TextIO
+from typing import List, Dict, Optional, Union, Iterable, Iterator, Collection, Any, BinaryIO, TextIO, Callable, Tuple
 
 from .constants import ALL_CASES, ALL_COREFS, SID_PTN, SID_PTN_KWDLC, SID_PTN_WAC
-from .document import Document
+from .document import Document, LazyDocument
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARNING)
 
+# SID_PTN_KWDLC, SID_PTN_WAC and SID_PTN fused into one pattern that tries them in this order, so that an S-ID is
+# matched in a single call; the document ID is captured by the named group of the matched branch
+_SID_PTN_ANY = re.compile('|'.join(
+    '(?:' + ptn.pattern.replace('(?P<sid>', '(?:').replace('(?P<did>', f'(?P<{name}>') + ')'
+    for name, ptn in (('kwdlc', SID_PTN_KWDLC), ('wac', SID_PTN_WAC), ('other', SID_PTN))
+))
+# the first token following "# S-ID:" at the beginning of a line
+_SID_LINE_PTN = re.compile(r'^# S-ID:[^\S\n]*(\S+)', re.MULTILINE)
+
+
+# a reader shared by all the tasks in a worker process, set by _init_worker
+_worker_reader: Optional['KyotoReader'] = None
+
+
+def _init_worker(reader: 'KyotoReader') -> None:
+    global _worker_reader
+    _worker_reader = reader
+
+
+def _process_document_in_worker(doc_id: str) -> Optional[Document]:
+    return _worker_reader.process_document(doc_id)
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode UTF-8 bytes read at once, translating newlines as in text mode.
+
+    This is faster than reading the same data through io.TextIOWrapper.
+    """
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _get_chunksize(num_tasks: int, n_jobs: int) -> int:
+    """Return a chunk size that sends each worker about four batches of tasks to reduce the IPC overhead."""
+    return max(1, num_tasks // (n_jobs * 4))
+
 
 class ArchiveType(Enum):
     """Enum for file collection types."""
@@ -33,7 +72,9 @@ class ArchiveHandler:
     def __init__(self, path: Path) -> None:
         self.path: Path = path
         self.type: ArchiveType = self._get_type(path)
-        self.members: List[str] = self._list_members()
+        self._members: Optional[List[str]] = None
+        # a member name -> its TarInfo or ZipInfo, which saves looking up the member by name every time it is opened
+        self._member_infos: Dict[str, Union[tarfile.TarInfo, zipfile.ZipInfo]] = {}
 
     @staticmethod
     def _get_type(path: Path) -> ArchiveType:
@@ -45,22 +86,60 @@ class ArchiveHandler:
         else:
             raise ValueError(f'Unsupported archive type: {path}')
 
-    def _list_members(self) -> List[str]:
+    @property
+    def members(self) -> List[str]:
+        """Names of the members in the archive."""
+        if self._members is None:
+            with self.open() as archive:
+                self.list_members(archive)
+        return self._members
+
+    def list_members(self, archive: ArchiveFile) -> List[str]:
+        """Return names of the members using an opened archive, which can be used to read the members afterwards."""
         if self.type == ArchiveType.TAR_GZ:
-            with tarfile.open(self.path, mode='r') as f:
-                return f.getnames()
+            self._member_infos = {info.name: info for info in archive.getmembers()}
+            self._members = [info.name for info in archive.getmembers()]
         elif self.type == ArchiveType.ZIP:
-            with zipfile.ZipFile(self.path, mode='r') as f:
-                return f.namelist()
+            self._member_infos = {info.filename: info for info in archive.infolist()}
+            self._members = [info.filename for info in archive.infolist()]
         else:
             raise ValueError(f'Unsupported archive type: {self.type}')
+        return self._members
+
+    def iter_stream(self) -> Iterator[Tuple[str, Optional[BinaryIO]]]:
+        """Iterate over the members of a tar.gz archive in a single pass over the gzip stream.
+
+        Link members are yielded after all the other members since they are resolved by random access.
+
+        Yields:
+            Tuple[str, Optional[BinaryIO]]: The name of a member and its content, which can be read only until the next
+                member is yielded.
+        """
+        assert self.type == ArchiveType.TAR_GZ
+        links: List[tarfile.TarInfo] = []
+        with tarfile.open(self.path, mode='r|gz') as archive:
+            for info in archive:
+                if info.islnk() or info.issym():
+                    # the target of a link cannot be read again from a stream
+                    links.append(info)
+                    continue
+                yield info.name, archive.extractfile(info)
+            infos = archive.getmembers()
+        self._member_infos = {info.name: info for info in infos}
+        self._members = [info.name for info in infos]
+        if links:
+            logger.info(f'{len(links)} link members in {self.path} are read by random access')
+            with self.open() as archive:
+                for info in links:
+                    with self.open_member(archive, info.name) as f:
+                        yield info.name, f
 
     @contextmanager
     def open(self) -> ArchiveFile:
         file = None
         try:
             if self.type == ArchiveType.TAR_GZ:
-                file = tarfile.open(self.path, mode='r')
+                file = tarfile.open(self.path, mode='r:gz')
             elif self.type == ArchiveType.ZIP:
                 file = zipfile.ZipFile(self.path, mode='r')
             else:
@@ -74,9 +153,9 @@ class ArchiveHandler:
         file = None
         try:
             if self.type == ArchiveType.TAR_GZ:
-                file = archive.extractfile(member)
+                file = archive.extractfile(self._member_infos.get(member, member))
             elif self.type == ArchiveType.ZIP:
-                file = archive.open(member)
+                file = archive.open(self._member_infos.get(member, member))
             else:
                 raise ValueError(f'Unsupported archive type: {self.type}')
             yield file
@@ -98,17 +177,18 @@ class FileType(Enum):
 class FileHandler:
     def __init__(self, path: Path) -> None:
         self.path: Path = path
-        self.type: FileType = self._get_type(path)
+        name = path.name
+        self.type: FileType = self._get_type(name)
+        # the file name without the compression suffix, which is used to filter files by extension
+        self._content_basename: str = name[:-len(self.type.value)] if self.type.value else name
 
     @property
     def content_basename(self) -> str:
-        if self.type == FileType.UNCOMPRESSED:
-            return self.path.name
-        return self.path.name[:-len(self.type.value)]
+        return self._content_basename
 
     @staticmethod
-    def _get_type(path: Path) -> FileType:
-        if path.suffix == FileType.GZ.value:
+    def _get_type(name: str) -> FileType:
+        if name.endswith(FileType.GZ.value):
             return FileType.GZ
         return FileType.UNCOMPRESSED
 
@@ -126,6 +206,14 @@ class FileHandler:
         finally:
             hasattr(file, 'close') and file.close()
 
+    def read_text(self) -> str:
+        """Read the whole file as a string, translating newlines as in text mode."""
+        if self.type == FileType.GZ:
+            # decompressing at once in C is faster than decoding a stream from GzipFile
+            return _decode_text(gzip.decompress(self.path.read_bytes()))
+        with self.open(mode='rt') as f:
+            return f.read()
+
     def __lt__(self, other) -> bool:
         return self.path < other.path
 
@@ -145,7 +233,15 @@ class KyotoReader:
         pickle_ext (str): Document を pickle 形式で読む場合の拡張子 (default: pkl)
         use_pas_tag (bool): <rel>タグからではなく、<述語項構造:>タグから PAS を読むかどうか (default: False)
         n_jobs (int): 文書を読み込む処理の並列数。0: 並列処理なし、-1: コア数 (default: -1)
+            zip アーカイブの場合はプロセスではなくスレッドで並列化する
         did_from_sid (bool): 文書IDを文書中のS-IDから決定する (default: True)
+        cache_size (int): process_document の結果を保持する文書数。0 の場合キャッシュしない (default: 0)
+            キャッシュされた文書は同じオブジェクトが返されるため、変更しないこと
+        eager (bool): KNP 形式の文書をすぐに解析するかどうか。False の場合、属性に初めてアクセスした時に解析する
+            LazyDocument を返す (default: True)
+        text_cache_size (int): 複数の文書を含むファイルについて、内容を保持するファイル数 (default: 8)
+            読み込む文書がこの数より多くのファイルにまたがる順で要求されると、文書ごとにファイル全体を読み直す。
+            並列処理時は各ワーカーが個別に保持する
 
     Note:
         サポートされる入力パス (i.e. `source` argument)
@@ -165,61 +261,116 @@ class KyotoReader:
                  pickle_ext: str = '.pkl',
                  n_jobs: int = -1,
                  did_from_sid: bool = True,
+                 cache_size: int = 0,
+                 eager: bool = True,
+                 text_cache_size: int = 8,
                  ) -> None:
         if not (isinstance(source, Path) or isinstance(source, str)):
             raise TypeError(f"document source must be Path or str type, but got '{type(source)}' type")
         source = Path(source)
         self.archive_handler = None
 
-        if source.is_dir():
-            logger.info(f'got a directory path, files in the directory are treated as source files')
-            file_paths: List[FileHandler] = sorted(FileHandler(p) for p in source.glob(f'**/*') if p.is_file())
-        elif ArchiveHandler.is_supported_path(source):
-            logger.info(f'got an archive file path, files in the archive are treated as source files')
-            self.archive_handler = ArchiveHandler(source)
-            file_paths: List[FileHandler] = sorted(FileHandler(Path(p)) for p in self.archive_handler.members)
-        elif source.is_file():
-            logger.info(f'got a single file path, this file is treated as a source file')
-            file_paths: List[FileHandler] = [FileHandler(source)]
-        else:
-            raise ValueError(f'document source: {source} not found')
-
-        # If True, determine the document ID from the sentence ID in the document.
-        self.did_from_sid: bool = did_from_sid
-
-        self._did2pkl = {file.path.stem: file for file in file_paths if file.content_basename.endswith(pickle_ext)}
-        if n_jobs == -1:
-            self.n_jobs = os.cpu_count()
-        elif n_jobs >= 0:
-            self.n_jobs = n_jobs
-        else:
-            raise ValueError(f'n_jobs must be >= 0 or -1, but got {n_jobs}')
-        if self.n_jobs > 0 and self.archive_handler is not None:
-            logger.info('Multiprocessing with archive is too slow, so it is disabled')
-            logger.info(
-                'Running without multiprocessing can be relatively slow, consider unarchiving the input file in advance'
-            )
-            self.n_jobs = 0
-
-        self._did2knp: Dict[str, str] = {}
-        self._did2file: Dict[str, FileHandler] = {}
-        if self.did_from_sid is True:
-            with (self.archive_handler.open() if self.archive_handler else nullcontext()) as archive:
-                args_iter = (
-                    (self, file, archive) for file in file_paths if file.content_basename.endswith(knp_ext)
+        with ExitStack() as stack:
+            archive: Optional[ArchiveFile] = None
+            member_texts: Dict[str, str] = {}  # a member name -> the content of the member read in advance
+            # filter file names before constructing Path objects since there can be many files
+            exts = tuple(ext + file_type.value for ext in (knp_ext, pickle_ext) for file_type in FileType)
+            if source.is_dir():
+                logger.info(f'got a directory path, files in the directory are treated as source files')
+                # os.walk lists files and directories in a single traversal without calling stat for each file
+                file_paths: List[FileHandler] = sorted(
+                    FileHandler(Path(root) / name)
+                    for root, _, names in os.walk(source) for name in names if name.endswith(exts)
                 )
-                if self.n_jobs > 0:
-                    with futures.ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
-                        rets: Iterable[Dict[str, str]] = executor.map(KyotoReader._read_knp_wrapper, *zip(*args_iter))
+            elif ArchiveHandler.is_supported_path(source):
+                logger.info(f'got an archive file path, files in the archive are treated as source files')
+                self.archive_handler = ArchiveHandler(source)
+                if did_from_sid is True and self.archive_handler.type == ArchiveType.TAR_GZ:
+                    # all the KNP files are read right away, so read them in the order they are stored in the archive
+                    knp_exts = tuple(knp_ext + file_type.value for file_type in FileType)
+                    for name, f in self.archive_handler.iter_stream():
+                        if f is not None and name.endswith(knp_exts):
+                            member_texts[str(Path(name))] = _decode_text(f.read())
+                    members = self.archive_handler.members
                 else:
-                    rets: List[Dict[str, str]] = [KyotoReader._read_knp_wrapper(*args) for args in args_iter]
-            self._did2knp.update(dict(ChainMap(*rets)))
-        else:
-            self._did2file.update(
-                {file.path.stem: file for file in file_paths if file.content_basename.endswith(knp_ext)}
-            )
+                    # the archive is opened only once to both list and read the members
+                    archive = stack.enter_context(self.archive_handler.open())
+                    members = self.archive_handler.list_members(archive)
+                file_paths: List[FileHandler] = sorted(FileHandler(Path(p)) for p in members if p.endswith(exts))
+            elif source.is_file():
+                logger.info(f'got a single file path, this file is treated as a source file')
+                file_paths: List[FileHandler] = [FileHandler(source)]
+            else:
+                raise ValueError(f'document source: {source} not found')
+
+            # If True, determine the document ID from the sentence ID in the document.
+            self.did_from_sid: bool = did_from_sid
+
+            # classify the files in a single pass
+            knp_files: List[FileHandler] = []
+            self._did2pkl: Dict[str, FileHandler] = {}
+            for file in file_paths:
+                content_basename = file.content_basename
+                if content_basename.endswith(pickle_ext):
+                    self._did2pkl[file.path.stem] = file
+                if content_basename.endswith(knp_ext):
+                    knp_files.append(file)
+            if n_jobs == -1:
+                self.n_jobs = os.cpu_count()
+            elif n_jobs >= 0:
+                self.n_jobs = n_jobs
+            else:
+                raise ValueError(f'n_jobs must be >= 0 or -1, but got {n_jobs}')
+            if self.n_jobs > 0 and self.archive_handler is not None and self.archive_handler.type == ArchiveType.TAR_GZ:
+                # each worker would have to decompress the archive from the beginning to seek to a member
+                logger.info('Parallel processing with tar.gz archive is too slow, so it is disabled')
+                logger.info(
+                    'Running without parallel processing can be relatively slow, consider unarchiving the input file '
+                    'in advance'
+                )
+                self.n_jobs = 0
+
+            self._did2knp: Dict[str, str] = {}
+            self._did2file: Dict[str, FileHandler] = {}
+            # a document ID -> the file that contains the document and the span of the document in the file
+            self._did2span: Dict[str, Tuple[FileHandler, int, int]] = {}
+            # contents of the files read recently, ordered from the least recently used one
+            self._text_cache: 'OrderedDict[Path, str]' = OrderedDict()
+            self.text_cache_size: int = text_cache_size
+            if self.did_from_sid is True:
+                if self.archive_handler is not None:
+                    # archive members are expensive to reopen, so keep the KNP strings in memory
+                    if self.archive_handler.type == ArchiveType.TAR_GZ:
+                        rets: List[Dict[str, str]] = [
+                            self._read_knp(member_texts[str(file.path)], file.path, did_from_sid=True)
+                            for file in knp_files
+                        ]
+                    elif self.n_jobs > 0:
+                        rets: List[Dict[str, str]] = self._map_with_archive_in_threads(
+                            self._read_knp_wrapper, knp_files, self.n_jobs
+                        )
+                    else:
+                        rets: List[Dict[str, str]] = [self._read_knp_wrapper(file, archive) for file in knp_files]
+                    self._did2knp.update(self._merge_did_mappings(rets))
+                else:
+                    # keep only where each document is, and read the file again when the document is requested
+                    if self.n_jobs > 0:
+                        with futures.ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                            rets: List[Dict[str, Tuple[FileHandler, int, int]]] = list(executor.map(
+                                KyotoReader._scan_knp_wrapper, repeat(self), knp_files,
+                                chunksize=_get_chunksize(len(knp_files), self.n_jobs),
+                            ))
+                    else:
+                        rets: List[Dict[str, Tuple[FileHandler, int, int]]] = [
+                            self._scan_knp_wrapper(file) for file in knp_files
+                        ]
+                    self._did2span.update(self._merge_did_mappings(rets))
+            else:
+                self._did2file.update({file.path.stem: file for file in knp_files})
 
-        self.doc_ids: List[str] = sorted({*self._did2knp.keys(), *self._did2pkl.keys(), *self._did2file.keys()})
+        self.doc_ids: List[str] = sorted(
+            {*self._did2knp.keys(), *self._did2span.keys(), *self._did2pkl.keys(), *self._did2file.keys()}
+        )
 
         self.target_cases: Collection[str] = self._get_targets(target_cases, ALL_CASES, 'case')
         self.target_corefs: Collection[str] = self._get_targets(target_corefs, ALL_COREFS, 'coref')
@@ -228,25 +379,100 @@ class KyotoReader:
         self.use_pas_tag: bool = use_pas_tag
         self.knp_ext: str = knp_ext
         self.pickle_ext: str = pickle_ext
+        self.cache_size: int = cache_size
+        self.eager: bool = eager
+        # recently processed documents, ordered from the least recently used one
+        self._doc_cache: 'OrderedDict[str, Document]' = OrderedDict()
+        self._doc_cache_lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the reader is sent to worker processes, but a lock cannot be pickled and the file contents are too large
+        state = self.__dict__.copy()
+        state.pop('_doc_cache_lock', None)
+        state.pop('_text_cache', None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._doc_cache_lock = threading.Lock()
+        self._text_cache = OrderedDict()
+
+    def _map_with_archive_in_threads(self,
+                                     func: Callable[[Any, ArchiveFile], Any],
+                                     items: List[Any],
+                                     n_jobs: int,
+                                     ) -> List[Any]:
+        """Apply func to each item in a thread pool, where each thread reads from its own handle of the archive.
+
+        Archive objects cannot be sent to worker processes, and a single handle cannot be shared between threads.
 
-    def get_knp(self, did: str) -> str:
+        Args:
+            func (Callable[[Any, ArchiveFile], Any]): A function that takes an item and an archive.
+            items (List[Any]): Items to process.
+            n_jobs (int): The number of threads.
+
+        Returns:
+            List[Any]: The results in the same order as the items.
+        """
+        local = threading.local()
+        lock = threading.Lock()
+        with ExitStack() as stack:
+            def open_archive() -> None:
+                with lock:
+                    local.archive = stack.enter_context(self.archive_handler.open())
+
+            with futures.ThreadPoolExecutor(max_workers=n_jobs, initializer=open_archive) as executor:
+                return list(executor.map(lambda item: func(item, local.archive), items))
+
+    @staticmethod
+    def _merge_did_mappings(mappings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge per-file mappings from a document ID, keeping the first one when a document ID is duplicated."""
+        merged = {}
+        # update in reverse order so that the first file wins
+        for mapping in reversed(mappings):
+            merged.update(mapping)
+        if len(merged) < sum(map(len, mappings)):
+            logger.warning('duplicated document IDs found, only the first documents are used')
+        return merged
+
+    def _read_text(self, file: FileHandler) -> str:
+        """Read a file, reusing the contents of the files read recently since nearby documents often share a file."""
+        if file.path in self._text_cache:
+            self._text_cache.move_to_end(file.path)
+            return self._text_cache[file.path]
+        text = file.read_text()
+        self._text_cache[file.path] = text
+        if len(self._text_cache) > self.text_cache_size:
+            self._text_cache.popitem(last=False)
+        return text
+
+    def get_knp(self, did: str, archive: Optional[ArchiveFile] = None) -> str:
         if did in self._did2knp:
             return self._did2knp[did]
-        with (self.archive_handler.open() if self.archive_handler else nullcontext()) as archive:
-            if did in self._did2file:
-                self._did2knp.update(self._read_knp_wrapper(self._did2file[did], archive))
-                return self._did2knp[did]
-            if did in self._did2pkl:
-                if archive is not None:
-                    with self.archive_handler.open_member(archive, str(self._did2pkl[did].path)) as f:
-                        document = pickle.load(f)
-                else:
-                    with self._did2pkl[did].open(mode='rb') as f:
-                        document = pickle.load(f)
-                self._did2knp[did] = document.knp_string
-                return self._did2knp[did]
+        if did in self._did2span:
+            file, start, end = self._did2span[did]
+            return self._read_text(file)[start:end]
+        if archive is None and self.archive_handler is not None:
+            with self.archive_handler.open() as archive:
+                return self.get_knp(did, archive=archive)
+        if did in self._did2file:
+            self._did2knp.update(self._read_knp_wrapper(self._did2file[did], archive))
+            return self._did2knp[did]
+        if did in self._did2pkl:
+            document = self._load_pickle(did, archive)
+            self._did2knp[did] = document.knp_string
+            return self._did2knp[did]
         raise ValueError(f'document id: {did} not found')
 
+    def _load_pickle(self, did: str, archive: Optional[ArchiveFile]) -> Document:
+        # reading the whole pickle at once is faster than letting the unpickler read a compressed stream piece by piece
+        if archive is not None:
+            with self.archive_handler.open_member(archive, str(self._did2pkl[did].path)) as f:
+                return pickle.loads(f.read())
+        else:
+            with self._did2pkl[did].open(mode='rb') as f:
+                return pickle.loads(f.read())
+
     def _read_knp_wrapper(self,
                           file: FileHandler,
                           archive: Optional[ArchiveFile] = None,
@@ -263,39 +489,65 @@ class KyotoReader:
 
         if archive is not None:
             with self.archive_handler.open_member(archive, str(file.path)) as f:
-                return self._read_knp(io.TextIOWrapper(f, encoding='utf-8'), file.path, did_from_sid=self.did_from_sid)
+                text = _decode_text(f.read())
         else:
-            with file.open(mode='rt') as f:
-                return self._read_knp(f, file.path, did_from_sid=self.did_from_sid)
+            text = file.read_text()
+        return self._read_knp(text, file.path, did_from_sid=self.did_from_sid)
+
+    def _scan_knp_wrapper(self, file: FileHandler) -> Dict[str, Tuple[FileHandler, int, int]]:
+        """Find documents in KNP format file that is located at the specified path without keeping their contents.
+
+        Args:
+            file (FileHandler): A file handler indicating a path to a KNP format file.
+
+        Returns:
+            Dict[str, Tuple[FileHandler, int, int]]: A mapping from a document ID to the file and the span of the
+            document in the content of the file.
+        """
+        did2span = self._split_knp(file.read_text(), file.path, did_from_sid=self.did_from_sid)
+        return {did: (file, start, end) for did, (start, end) in did2span.items()}
 
     @staticmethod
-    def _read_knp(file: TextIO,
+    def _read_knp(text: str,
                   path: Path,
                   did_from_sid: bool
                   ) -> Dict[str, str]:
-        buff = ''
-        did = sid = None
-        did2knps = {}
-        for line in file:
-            if line.startswith('# S-ID:') and did_from_sid is True:
-                sid_string = line[7:].strip().split()[0]
-                match = SID_PTN_KWDLC.match(sid_string) or SID_PTN_WAC.match(sid_string) or SID_PTN.match(sid_string)
-                if match is None:
-                    raise ValueError(f'unsupported S-ID format: {sid_string} in {path}')
-                if did != match.group('did') or sid == match.group('sid'):
-                    if did is not None:
-                        did2knps[did] = buff
-                        buff = ''
-                    did = match.group('did')
-                    sid = match.group('sid')
-            buff += line
+        did2span = KyotoReader._split_knp(text, path, did_from_sid)
+        return {did: text[start:end] for did, (start, end) in did2span.items()}
+
+    @staticmethod
+    def _split_knp(text: str,
+                   path: Path,
+                   did_from_sid: bool
+                   ) -> Dict[str, Tuple[int, int]]:
+        """Return a mapping from a document ID to the span of the document in the given KNP format string."""
         if did_from_sid is False:
-            did = path.stem
-        if did is not None and buff:
-            did2knps[did] = buff
+            if not text:
+                logger.warning(f'empty file found and skipped: {path}')
+                return {}
+            return {path.stem: (0, len(text))}
+
+        # scan only the S-ID lines and split the whole text at document boundaries
+        did = sid = None
+        start = 0
+        did2span = {}
+        for sid_match in _SID_LINE_PTN.finditer(text):
+            sid_string = sid_match.group(1)
+            match = _SID_PTN_ANY.match(sid_string)
+            if match is None:
+                raise ValueError(f'unsupported S-ID format: {sid_string} in {path}')
+            match_did = match.group('kwdlc') or match.group('wac') or match.group('other')
+            if did != match_did or sid == sid_string:
+                if did is not None:
+                    did2span[did] = (start, sid_match.start())
+                    start = sid_match.start()
+                did = match_did
+                sid = sid_string
+        if did is not None:
+            did2span[did] = (start, len(text))
         else:
             logger.warning(f'empty file found and skipped: {path}')
-        return did2knps
+        return did2span
 
     @staticmethod
     def _get_targets(input_: Optional[Collection],
@@ -323,20 +575,30 @@ class KyotoReader:
             doc_id (str): An ID of a document to process.
             archive (Optional[ArchiveFile]): An archive to read the document from.
         """
+        # this method can be called from several threads (see _map_with_archive_in_threads)
+        with self._doc_cache_lock:
+            if doc_id in self._doc_cache:
+                self._doc_cache.move_to_end(doc_id)
+                return self._doc_cache[doc_id]
+        document = self._process_document(doc_id, archive)
+        if self.cache_size > 0 and document is not None:
+            with self._doc_cache_lock:
+                self._doc_cache[doc_id] = document
+                if len(self._doc_cache) > self.cache_size:
+                    self._doc_cache.popitem(last=False)
+        return document
+
+    def _process_document(self, doc_id: str, archive: Optional[ArchiveFile]) -> Optional[Document]:
         if doc_id in self._did2pkl:
-            if archive is not None:
-                with self.archive_handler.open_member(archive, str(self._did2pkl[doc_id].path)) as f:
-                    return pickle.load(f)
-            else:
-                with self._did2pkl[doc_id].open(mode='rb') as f:
-                    return pickle.load(f)
-        return Document(self.get_knp(doc_id),
-                        doc_id,
-                        self.target_cases,
-                        self.target_corefs,
-                        self.relax_cases,
-                        self.extract_nes,
-                        self.use_pas_tag)
+            return self._load_pickle(doc_id, archive)
+        document_class = Document if self.eager else LazyDocument
+        return document_class(self.get_knp(doc_id, archive=archive),
+                              doc_id,
+                              self.target_cases,
+                              self.target_corefs,
+                              self.relax_cases,
+                              self.extract_nes,
+                              self.use_pas_tag)
 
     def process_documents(self,
                           doc_ids: Iterable[str],
@@ -348,22 +610,68 @@ class KyotoReader:
             doc_ids (List[str]): IDs of documents to process.
             n_jobs (int): The number of processes spawned to finish this task. (default: inherit from self)
         """
+        n_jobs = self._resolve_n_jobs(n_jobs)
+        doc_ids = list(doc_ids)
+        if n_jobs > 0 and self.archive_handler is not None:
+            return self._map_with_archive_in_threads(self.process_document, doc_ids, n_jobs)
+        if n_jobs > 0:
+            # send the reader, which can hold many KNP strings, to each worker once instead of with every task
+            with futures.ProcessPoolExecutor(max_workers=n_jobs,
+                                             initializer=_init_worker,
+                                             initargs=(self,)) as executor:
+                rets: Iterable[Optional[Document]] = executor.map(
+                    _process_document_in_worker, doc_ids, chunksize=_get_chunksize(len(doc_ids), n_jobs)
+                )
+                return list(rets)
+        with (self.archive_handler.open() if self.archive_handler else nullcontext()) as archive:
+            return [self.process_document(doc_id, archive=archive) for doc_id in doc_ids]
+
+    def iter_documents(self,
+                       doc_ids: Iterable[str],
+                       n_jobs: Optional[int] = None,
+                       ) -> Iterator[Optional[Document]]:
+        """Process multiple documents following the given document IDs and yield them in the same order.
+
+        Unlike :meth:`process_documents`, only a few processed documents per worker are kept in memory at once.
+        Documents in an archive are processed sequentially.
+
+        Args:
+            doc_ids (Iterable[str]): IDs of documents to process.
+            n_jobs (int): The number of processes spawned to finish this task. (default: inherit from self)
+        """
+        n_jobs = self._resolve_n_jobs(n_jobs)
+        if n_jobs == 0 or self.archive_handler is not None:
+            with (self.archive_handler.open() if self.archive_handler else nullcontext()) as archive:
+                for doc_id in doc_ids:
+                    yield self.process_document(doc_id, archive=archive)
+            return
+
+        with futures.ProcessPoolExecutor(max_workers=n_jobs,
+                                         initializer=_init_worker,
+                                         initargs=(self,)) as executor:
+            pending = deque()
+            try:
+                for doc_id in doc_ids:
+                    pending.append(executor.submit(_process_document_in_worker, doc_id))
+                    # keep the workers busy while bounding the number of documents waiting to be consumed
+                    if len(pending) >= n_jobs * 2:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _resolve_n_jobs(self, n_jobs: Optional[int]) -> int:
         if n_jobs is None:
             n_jobs = self.n_jobs
         elif n_jobs == -1:
             n_jobs = os.cpu_count()
         elif n_jobs < -1:
             raise ValueError(f'n_jobs must be >= 0 or -1, but got {n_jobs}')
-        if self.archive_handler is not None:
+        if self.archive_handler is not None and self.archive_handler.type == ArchiveType.TAR_GZ:
             assert n_jobs == 0
-        with (self.archive_handler.open() if self.archive_handler else nullcontext()) as archive:
-            process_document = partial(KyotoReader.process_document, self, archive=archive)
-            if n_jobs > 0:
-                with futures.ProcessPoolExecutor(max_workers=n_jobs) as executor:
-                    rets: Iterable[Optional[Document]] = executor.map(process_document, doc_ids)
-            else:
-                rets: Iterable[Optional[Document]] = map(process_document, doc_ids)
-            return list(rets)
+        return n_jobs
 
     def process_all_documents(self,
                               n_jobs: Optional[int] = None,
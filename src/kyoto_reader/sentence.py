@@ -1,8 +1,7 @@
 import logging
-from collections import ChainMap
 from typing import List, Dict, Optional, Iterator
 
-from pyknp import BList, Morpheme
+from pyknp import BList, Bunsetsu, Tag, Morpheme
 
 from .base_phrase import BasePhrase
 
@@ -17,6 +16,7 @@ class Sentence:
         blist (BList): BList object of pyknp.
         doc_id (str): The document ID of this sentence.
         bps (List[BasePhrase]): Base phrases in this sentence.
+        dmid_offset (int): The document-wide morpheme ID of the first morpheme in this sentence.
     """
 
     def __init__(self,
@@ -36,17 +36,21 @@ class Sentence:
 
         self.blist = BList(knp_string)
         self.doc_id: str = doc_id
+        self.dmid_offset: int = dmid_offset
+        # pyknp rebuilds these lists on every call
+        self._tag_list: List[Tag] = self.blist.tag_list()
+        self._mrph_list: List[Morpheme] = self.blist.mrph_list()
 
         self.bps: List[BasePhrase] = []
         dtid = dtid_offset
         dmid = dmid_offset
-        for tag in self.blist.tag_list():
+        for tag in self._tag_list:
             base_phrase = BasePhrase(tag, dmid, dtid, self.blist.sid, doc_id)
             self.bps.append(base_phrase)
             dtid += 1
             dmid += len(base_phrase)
 
-        self._mrph2dmid: Dict[Morpheme, int] = dict(ChainMap(*(bp.mrph2dmid for bp in self.bps)))
+        self._mrph2dmid: Dict[Morpheme, int] = dict(zip(self._mrph_list, range(dmid_offset, dmid)))
 
         for bp in self.bps:
             if bp.tag.parent_id >= 0:
@@ -54,6 +58,15 @@ class Sentence:
             for child in bp.tag.children:
                 bp.children.append(self.bps[child.tag_id])
 
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if 'dmid_offset' not in state:
+            # pickled by kyoto-reader 2.5.2 or earlier
+            self._tag_list = self.blist.tag_list()
+            self._mrph_list = self.blist.mrph_list()
+            self.dmid_offset = min(self._mrph2dmid.values(), default=0)
+            self._mrph2dmid = {mrph: self._mrph2dmid[mrph] for mrph in self._mrph_list}
+
     @property
     def sid(self) -> str:
         """A sentence ID."""
@@ -74,17 +87,17 @@ class Sentence:
         """A surface expression"""
         return ''.join(bp.surf for bp in self.bps)
 
-    def bnst_list(self):
+    def bnst_list(self) -> List[Bunsetsu]:
         """Return list of Bunsetsu object in pyknp."""
         return self.blist.bnst_list()
 
-    def tag_list(self):
-        """Return list of Tag object in pyknp."""
-        return self.blist.tag_list()
+    def tag_list(self) -> List[Tag]:
+        """Return list of Tag object in pyknp. The returned list is shared and must not be modified."""
+        return self._tag_list
 
-    def mrph_list(self):
-        """Return list of Morpheme object in pyknp."""
-        return self.blist.mrph_list()
+    def mrph_list(self) -> List[Morpheme]:
+        """Return list of Morpheme object in pyknp. The returned list is shared and must not be modified."""
+        return self._mrph_list
 
     def __len__(self) -> int:
         """Number of base phrases in this sentence"""
@@ -1,3 +1,7 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
 from typing import List, Dict
 
 from kyoto_reader import KyotoReader, Mention, Entity, Predicate, SpecialArgument, Argument
@@ -172,6 +176,20 @@ def test_pas_relax(fixture_kyoto_reader: KyotoReader):
     assert tuple(arg) == ('著者', 5, 'exo', '')
 
 
+def test_arguments_cases(fixture_kyoto_reader: KyotoReader):
+    document = fixture_kyoto_reader.process_document('w201106-0000060560')
+    predicate: Predicate = document.get_predicates()[3]
+    assert predicate.dtid == 6
+    cases = ['ガ', 'ガ２']
+    # without optional arguments, every target case has an entry even if it has no arguments
+    other_cases = [case for case in document.cases if case not in cases]
+    for relax in (False, True):
+        assert list(document.get_arguments(predicate, relax=relax, include_optional=True).keys()) == cases
+        arguments = document.get_arguments(predicate, relax=relax, include_optional=False)
+        assert list(arguments.keys()) == cases + other_cases
+        assert all(arguments[case] == [] for case in other_cases)
+
+
 def test_coref1(fixture_kyoto_reader: KyotoReader):
     document = fixture_kyoto_reader.process_document('w201106-0000060050')
     entities: Dict[int, Entity] = document.entities
@@ -344,6 +362,17 @@ def test_coref2(fixture_kyoto_reader: KyotoReader):
             mentions[3].eids) == ('皆様', 17, {14})
 
 
+def test_coref_eids(fixture_kyoto_reader: KyotoReader):
+    # a new entity takes the ID next to the largest one among the current entities
+    document = fixture_kyoto_reader.process_document('w201106-0000060877')
+    assert sorted(document.entities.keys()) == [0, 1, 3, 4, 5, 6, 7, 8, 10, 11, 12, 13, 14, 17, 19, 20, 21, 22, 23, 24,
+                                                25, 26, 27, 28]
+    assert document.mentions[3].eids == {6}
+    assert document.mentions[6].eids == {6}
+    assert document.mentions[16].eids == {8}
+    assert document.mentions[38].eids == {28}
+
+
 def test_coref_link1(fixture_kyoto_reader: KyotoReader):
     document = fixture_kyoto_reader.process_document('w201106-0000060050')
     for entity in document.entities.values():
@@ -409,3 +438,42 @@ def test_ne(fixture_kyoto_reader: KyotoReader):
     ne = nes[2]
     assert (ne.category, ne.name, ne.dmid_range) == (
         'LOCATION', 'ナザム村', range(39, 41))
+
+
+def test_bp_hash(fixture_kyoto_reader: KyotoReader):
+    document = fixture_kyoto_reader.process_document('w201106-0000060050')
+    bps = document.bp_list()
+    assert len(set(bps)) == len(bps)
+    for mention in document.mentions.values():
+        assert mention in set(bps)
+        assert hash(mention) == hash(bps[mention.dtid])
+
+
+def test_mention_hash_pickle(tmp_path: Path):
+    data_dir = Path(__file__).parent / 'data'
+    path = tmp_path / 'w201106-0000060050.pkl'
+    dump = (
+        'import pickle, sys\n'
+        'from kyoto_reader import KyotoReader\n'
+        'document = KyotoReader(sys.argv[1], n_jobs=0).process_document("w201106-0000060050")\n'
+        'with open(sys.argv[2], mode="wb") as f:\n'
+        '    pickle.dump(document, f)\n'
+    )
+    load = (
+        'import pickle, sys\n'
+        'from kyoto_reader import Mention\n'
+        'with open(sys.argv[1], mode="rb") as f:\n'
+        '    document = pickle.load(f)\n'
+        'bps = set(document.bp_list())\n'
+        'assert document.mentions\n'
+        'for mention in document.mentions.values():\n'
+        '    assert mention in bps\n'
+        'for entity in document.entities.values():\n'
+        '    for mention in entity.mentions:\n'
+        '        assert Mention(document.bp_list()[mention.dtid]) in entity.mentions\n'
+    )
+    # str hashes differ between interpreters with different PYTHONHASHSEED
+    subprocess.run([sys.executable, '-c', dump, str(data_dir / 'knp'), str(path)], check=True,
+                   env={**os.environ, 'PYTHONHASHSEED': '1'})
+    subprocess.run([sys.executable, '-c', load, str(path)], check=True,
+                   env={**os.environ, 'PYTHONHASHSEED': '2'})
@@ -1,6 +1,14 @@
+import gzip
+import pickle
+import tarfile
+from collections import defaultdict
+from concurrent import futures
 from pathlib import Path
 
-from kyoto_reader import KyotoReader
+import pytest
+
+from kyoto_reader import KyotoReader, LazyDocument, ALL_CASES, ALL_COREFS
+from kyoto_reader.reader import FileHandler
 
 
 def test_process_documents(fixture_kyoto_reader: KyotoReader):
@@ -8,6 +16,107 @@ def test_process_documents(fixture_kyoto_reader: KyotoReader):
     assert [doc.doc_id for doc in documents] == fixture_kyoto_reader.doc_ids
 
 
+def test_iter_documents(fixture_kyoto_reader: KyotoReader):
+    documents = fixture_kyoto_reader.process_all_documents()
+    for n_jobs in (0, 2):
+        iterated = list(fixture_kyoto_reader.iter_documents(fixture_kyoto_reader.doc_ids, n_jobs=n_jobs))
+        assert [doc.knp_string for doc in iterated] == [doc.knp_string for doc in documents]
+
+
+def test_cache(fixture_kyoto_reader: KyotoReader):
+    data_dir = Path(__file__).parent / 'data'
+    reader = KyotoReader(data_dir / 'knp', n_jobs=0, cache_size=2)
+    doc_ids = reader.doc_ids[:3]
+    documents = [reader.process_document(doc_id) for doc_id in doc_ids]
+    assert documents == [fixture_kyoto_reader.process_document(doc_id) for doc_id in doc_ids]
+    assert list(reader._doc_cache.keys()) == doc_ids[1:]
+    assert reader.process_document(doc_ids[2]) is documents[2]
+    assert reader.process_document(doc_ids[0]) is not documents[0]
+
+
+def test_cache_threads():
+    data_dir = Path(__file__).parent / 'data'
+    reader = KyotoReader(data_dir / 'knp', n_jobs=0, cache_size=3, eager=False)
+    doc_ids = reader.doc_ids * 100
+    with futures.ThreadPoolExecutor(max_workers=8) as executor:
+        documents = list(executor.map(reader.process_document, doc_ids))
+    assert [document.doc_id for document in documents] == doc_ids
+    assert len(reader._doc_cache) == 3
+
+
+def test_lazy_document(fixture_kyoto_reader: KyotoReader):
+    data_dir = Path(__file__).parent / 'data'
+    reader = KyotoReader(data_dir / 'knp', n_jobs=0, eager=False)
+    for doc_id in reader.doc_ids:
+        expected = fixture_kyoto_reader.process_document(doc_id)
+        document = reader.process_document(doc_id)
+        assert 'sid2sentence' not in document.__dict__
+        assert document == expected
+        assert document.knp_string == expected.knp_string
+        assert [str(pas.predicate) for pas in document.pas_list()] == \
+               [str(pas.predicate) for pas in expected.pas_list()]
+        assert 'sid2sentence' in document.__dict__
+
+
+def test_symlinked_directory(tmp_path: Path):
+    data_dir = Path(__file__).parent / 'data'
+    source = tmp_path / 'source'
+    source.mkdir()
+    (source / 'w201106-0000060560.knp').symlink_to(data_dir / 'knp' / 'w201106-0000060560.knp')
+    linked = tmp_path / 'linked'
+    linked.mkdir()
+    (linked / 'w201106-0000060050.knp').symlink_to(data_dir / 'knp' / 'w201106-0000060050.knp')
+    (source / 'linked').symlink_to(linked, target_is_directory=True)
+    # symlinked files are read but symlinked directories are not followed
+    reader = KyotoReader(source, n_jobs=0)
+    assert reader.doc_ids == ['w201106-0000060560']
+
+
+def test_lazy_document_pickle():
+    data_dir = Path(__file__).parent / 'data'
+    reader = KyotoReader(data_dir / 'knp', n_jobs=0, eager=False)
+    document = reader.process_document(reader.doc_ids[0])
+    assert hasattr(document, '__getstate__') == hasattr(object(), '__getstate__')
+    loaded = pickle.loads(pickle.dumps(document))
+    assert 'sid2sentence' not in document.__dict__
+    assert 'sid2sentence' not in loaded.__dict__
+    assert loaded == document
+    assert len(loaded) == len(reader.process_document(reader.doc_ids[0]))
+
+
+def test_lazy_document_error():
+    # an invalid bunsetsu line
+    document = LazyDocument('# S-ID:1\n* x\nEOS\n', '1', ALL_CASES, ALL_COREFS, False, True, False)
+    with pytest.raises(Exception) as first:
+        _ = document.sid2sentence
+    with pytest.raises(Exception) as second:
+        _ = document.sid2sentence
+    assert type(first.value) is type(second.value)
+    assert not isinstance(first.value, AttributeError)
+
+
+def test_pickle_2_5_2(fixture_kyoto_reader: KyotoReader):
+    data_dir = Path(__file__).parent / 'data'
+    # pickled by kyoto-reader 2.5.2
+    pkl_reader = KyotoReader(data_dir / 'pkl_2.5.2', n_jobs=0)
+    doc_id = 'w201106-0002000016'
+    assert pkl_reader.doc_ids == [doc_id]
+    loaded = pkl_reader.process_document(doc_id)
+    expected = fixture_kyoto_reader.process_document(doc_id)
+    assert [sentence.dmid_offset for sentence in loaded] == [sentence.dmid_offset for sentence in expected]
+    assert [(bp.dtid, bp.dmids, bp.core, bp.dep_case) for bp in loaded.bp_list()] == \
+        [(bp.dtid, bp.dmids, bp.core, bp.dep_case) for bp in expected.bp_list()]
+    for relax in (False, True):
+        for predicate, pred_expected in zip(loaded.get_predicates(), expected.get_predicates()):
+            arguments = loaded.get_arguments(predicate, relax=relax)
+            arguments_expected = expected.get_arguments(pred_expected, relax=relax)
+            assert {case: sorted(map(str, args)) for case, args in arguments.items()} == \
+                {case: sorted(map(str, args)) for case, args in arguments_expected.items()}
+    assert sorted((mention.dtid, sorted(mention.eids)) for mention in loaded.mentions.values()) == \
+        sorted((mention.dtid, sorted(mention.eids)) for mention in expected.mentions.values())
+    assert [str(ne) for ne in loaded.named_entities] == [str(ne) for ne in expected.named_entities]
+
+
 def test_zip(fixture_kyoto_reader: KyotoReader):
     data_dir = Path(__file__).parent / 'data'
     zip_reader = KyotoReader(data_dir / 'compress_knp/knp.zip', n_jobs=0)
@@ -18,6 +127,16 @@ def test_zip(fixture_kyoto_reader: KyotoReader):
     )
 
 
+def test_zip_threads(fixture_kyoto_reader: KyotoReader):
+    data_dir = Path(__file__).parent / 'data'
+    zip_reader = KyotoReader(data_dir / 'compress_knp/knp.zip', n_jobs=2)
+    assert zip_reader.n_jobs == 2
+    assert fixture_kyoto_reader.doc_ids == zip_reader.doc_ids
+    documents = zip_reader.process_all_documents()
+    assert [doc.knp_string for doc in fixture_kyoto_reader.process_all_documents()] == \
+           [doc.knp_string for doc in documents]
+
+
 def test_tar_gzip(fixture_kyoto_reader: KyotoReader):
     data_dir = Path(__file__).parent / 'data'
     tar_gzip_reader = KyotoReader(data_dir / 'compress_knp/knp.tar.gz', n_jobs=0)
@@ -28,6 +147,30 @@ def test_tar_gzip(fixture_kyoto_reader: KyotoReader):
     )
 
 
+def test_tar_gzip_links(tmp_path: Path):
+    knp_dir = Path(__file__).parent / 'data' / 'knp'
+    archive_path = tmp_path / 'knp.tar.gz'
+    with tarfile.open(archive_path, mode='w:gz') as archive:
+        archive.add(knp_dir / 'w201106-0000060050.knp', arcname='data/w201106-0000060050.txt')
+        archive.add(knp_dir / 'w201106-0000060560.knp', arcname='knp/w201106-0000060560.knp')
+        # tar allows a member name to appear more than once (e.g. an appended archive)
+        archive.add(knp_dir / 'w201106-0000060560.knp', arcname='knp/w201106-0000060560.knp')
+        symlink = tarfile.TarInfo('knp/w201106-0000060050.knp')
+        symlink.type = tarfile.SYMTYPE
+        symlink.linkname = '../data/w201106-0000060050.txt'
+        archive.addfile(symlink)
+        hardlink = tarfile.TarInfo('knp/w201106-0000060560-copy.knp')
+        hardlink.type = tarfile.LNKTYPE
+        hardlink.linkname = 'knp/w201106-0000060560.knp'
+        archive.addfile(hardlink)
+    for did_from_sid in (True, False):
+        reader = KyotoReader(archive_path, did_from_sid=did_from_sid)
+        expected = KyotoReader(knp_dir, n_jobs=0)
+        assert reader.get_knp('w201106-0000060050') == expected.get_knp('w201106-0000060050')
+        assert reader.process_document('w201106-0000060050') == expected.process_document('w201106-0000060050')
+        assert reader.get_knp('w201106-0000060560') == expected.get_knp('w201106-0000060560')
+
+
 def test_gzip(fixture_kyoto_reader: KyotoReader):
     data_dir = Path(__file__).parent / 'data'
     gzip_reader = KyotoReader(data_dir / 'gzip_knp', n_jobs=0)
@@ -38,6 +181,40 @@ def test_gzip(fixture_kyoto_reader: KyotoReader):
     )
 
 
+def test_multi_document_gzip(tmp_path: Path, monkeypatch):
+    knp_dir = Path(__file__).parent / 'data' / 'knp'
+    with gzip.open(tmp_path / 'a.knp.gz', mode='wt') as f:
+        for did in ('w201106-0000060050', 'w201106-0002000028'):
+            f.write((knp_dir / f'{did}.knp').read_text())
+    with gzip.open(tmp_path / 'b.knp.gz', mode='wt') as f:
+        f.write((knp_dir / 'w201106-0000060560.knp').read_text())
+    reader = KyotoReader(tmp_path, n_jobs=0)
+    assert reader.doc_ids == ['w201106-0000060050', 'w201106-0000060560', 'w201106-0002000028']
+
+    num_reads = defaultdict(int)
+    read_text = FileHandler.read_text
+
+    def counting_read_text(self):
+        num_reads[self.path.name] += 1
+        return read_text(self)
+
+    monkeypatch.setattr(FileHandler, 'read_text', counting_read_text)
+    for did in reader.doc_ids:
+        assert reader.get_knp(did) == (knp_dir / f'{did}.knp').read_text()
+    # each file is decompressed only once even though the documents in a.knp.gz are not consecutive
+    assert num_reads == {'a.knp.gz': 1, 'b.knp.gz': 1}
+
+    # the file contents are not sent to worker processes
+    assert reader._text_cache
+    assert pickle.loads(pickle.dumps(reader))._text_cache == {}
+
+    reader = KyotoReader(tmp_path, n_jobs=0, text_cache_size=1)
+    num_reads.clear()
+    for did in reader.doc_ids:
+        assert reader.get_knp(did) == (knp_dir / f'{did}.knp').read_text()
+    assert num_reads == {'a.knp.gz': 2, 'b.knp.gz': 1}
+
+
 def test_lazy_load(fixture_kyoto_reader: KyotoReader):
     data_dir = Path(__file__).parent / 'data'
     reader = KyotoReader(data_dir / 'knp', did_from_sid=False, n_jobs=0)